@@ -0,0 +1,299 @@
+import argparse
+import heapq
+from collections import defaultdict, deque
+
+from failure_events import expand_failures
+from routing_engine import full_spf, parse_input_file, update_link
+
+# Hierarchical (OSPF-style) SPF: the nodes are split into areas and no SPF ever runs
+# over the whole network.
+#
+# A border router is a node with a link into another area. Each area keeps one
+# intra-area SPF tree per border router (links leaving the area are ignored), and
+# the backbone joins the border routers of all areas: the inter-area links as they
+# are, plus one summary link between every two border routers of the same area
+# costing their intra-area distance. A change inside an area only recomputes that
+# area's border trees and the summary links they give; a change on an inter-area
+# link only touches the backbone (and the border sets of its two areas when the
+# link appears or goes away).
+#
+# A query from src runs the intra-area SPF of src's area, then the backbone SPF
+# seeded with the distances from src to its area's border routers. Every shortest
+# path enters the destination's area for the last time through one of its border
+# routers, so the cost to dst is the best of the intra-area distance (same area) and
+# backbone distance + border tree distance over the border routers of dst's area.
+# The costs are exactly the ones of the flat dijkstra(); with several shortest paths
+# of the same cost, the path and predecessors can differ from the flat SPF tree.
+#
+# Areas are given as a file of "node: area" lines, or grown automatically by
+# breadth-first search in groups of area_size nodes. Nodes seen later join the area
+# of the node their first link goes to.
+#
+# routing = AreaRouting(graph, area_size=500)
+# routing.update(time_changes[5]); routing.cost("A", "F"); routing.path("A", "F")
+# python area_routing.py topology.txt --area-size 500 --validate
+
+# Nodes per automatically grown area
+DEFAULT_AREA_SIZE = 500
+
+
+# Function to read areas from "node: area" lines
+def load_areas(file_path):
+    areas = {}
+    with open(file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                node, area = line.split(":", 1)
+                areas[node.strip()] = area.strip()
+    return areas
+
+# Function to split a graph into connected areas of up to area_size nodes, each grown
+# breadth-first from the first node (in key order) not assigned yet
+def partition_areas(graph, area_size=DEFAULT_AREA_SIZE):
+    areas = {}
+    area = 0
+    for start in graph:
+        if start in areas:
+            continue
+        areas[start] = area
+        size = 1
+        queue = deque([start])
+        while queue and size < area_size:
+            for neighbor, weight in graph[queue.popleft()]:
+                if neighbor not in areas and size < area_size:
+                    areas[neighbor] = area
+                    size += 1
+                    queue.append(neighbor)
+        area += 1
+    return areas
+
+# Function to run Dijkstra's algorithm from several seeds {node: (distance, previous)},
+# optionally only over the links inside one area. Returns distance and predecessor
+# dicts of the nodes reached.
+def seeded_dijkstra(graph, seeds, areas=None, area=None):
+    distances, previous_nodes = {}, {}
+    pq = []
+    for node, (distance, previous) in seeds.items():
+        distances[node] = distance
+        previous_nodes[node] = previous
+        pq.append((distance, node))
+    heapq.heapify(pq)
+
+    while pq:
+        current_distance, current_node = heapq.heappop(pq)
+        if current_distance > distances[current_node]:
+            continue
+        for neighbor, weight in graph[current_node]:
+            if areas is not None and areas[neighbor] != area:
+                continue
+            distance = current_distance + weight
+            if distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                previous_nodes[neighbor] = current_node
+                heapq.heappush(pq, (distance, neighbor))
+    return distances, previous_nodes
+
+# Function to follow predecessors from node back to stop; returns [stop, ..., node]
+def trace_back(previous_nodes, node, stop):
+    path = [node]
+    while node != stop:
+        node = previous_nodes[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+class AreaRouting:
+    def __init__(self, graph, areas=None, area_size=DEFAULT_AREA_SIZE):
+        self.graph = defaultdict(list, ((node, list(edges)) for node, edges in graph.items()))
+        self.areas = dict(areas) if areas else partition_areas(self.graph, area_size)
+        for node in self.graph:
+            if node not in self.areas:
+                raise ValueError(f"node {node} has no area")
+        self.members = defaultdict(set)
+        for node in self.graph:
+            self.members[self.areas[node]].add(node)
+        self.borders = {}
+        self.border_trees = {}  # area -> {border: intra-area (distances, previous_nodes)}
+        self.backbone = {}  # border -> [(neighbor, cost)], inter-area and summary links
+        self.counts = defaultdict(int)
+        for area in self.members:
+            self._summarize(area)
+
+    # Function to recompute the border routers of an area, their intra-area trees and
+    # their backbone links
+    def _summarize(self, area):
+        areas, graph = self.areas, self.graph
+        for border in self.borders.get(area, ()):
+            self.backbone.pop(border, None)
+        borders = sorted(node for node in self.members[area]
+                         if any(areas[neighbor] != area for neighbor, weight in graph[node]))
+        self.borders[area] = borders
+        self.border_trees[area] = {border: seeded_dijkstra(graph, {border: (0, None)}, areas, area)
+                                   for border in borders}
+        for border in borders:
+            self._link_backbone(border)
+        self.counts["areas_summarized"] += 1
+        self.counts["border_trees"] += len(borders)
+
+    # Function to rebuild the backbone links of one border router
+    def _link_backbone(self, border):
+        area = self.areas[border]
+        distances = self.border_trees[area][border][0]
+        self.backbone[border] = ([(other, distances[other]) for other in self.borders[area]
+                                  if other != border and other in distances]
+                                 + [(neighbor, weight) for neighbor, weight in self.graph[border]
+                                    if self.areas[neighbor] != area])
+
+    # Function to apply one timestep's changes, recomputing only the areas they touch
+    def update(self, changes):
+        areas = self.areas
+        summarize, relink = set(), set()
+        for u, v, cost in expand_failures(self.graph, changes):
+            for node, other in ((u, v), (v, u)):
+                if node not in areas:
+                    areas[node] = areas[other] if other in areas else ("area", u)
+                    self.members[areas[node]].add(node)
+            update_link(self.graph, u, v, cost)
+            self.counts["changes"] += 1
+            if areas[u] == areas[v]:
+                summarize.add(areas[u])
+                continue
+            # An inter-area link only changes the backbone, unless a border set changes
+            for node in (u, v):
+                is_border = any(areas[neighbor] != areas[node] for neighbor, weight in self.graph[node])
+                if is_border != (node in self.backbone):
+                    summarize.add(areas[node])
+                else:
+                    relink.add(node)
+
+        for area in summarize:
+            self._summarize(area)
+        for node in relink:
+            if areas[node] not in summarize and node in self.backbone:
+                self._link_backbone(node)
+        self.counts["backbone_relinks"] += len(relink)
+
+    # Function to return the intra-area tree of src and the backbone SPF seeded from it
+    def _reach(self, src):
+        area = self.areas[src]
+        inner = seeded_dijkstra(self.graph, {src: (0, None)}, self.areas, area)
+        seeds = {border: (inner[0][border], None) for border in self.borders[area] if border in inner[0]}
+        self.counts["queries"] += 1
+        return inner, seeded_dijkstra(self.backbone, seeds)
+
+    # Function to find the cost from src to dst and the border router dst's area is
+    # entered through (None when the intra-area path is the best)
+    def _route(self, src, dst):
+        for node in (src, dst):
+            if node not in self.graph:
+                raise KeyError(node)
+        inner, backbone = self._reach(src)
+        area = self.areas[dst]
+        best = inner[0].get(dst, float('inf')) if area == self.areas[src] else float('inf')
+        entry = None
+        for border in self.borders[area]:
+            distance = backbone[0].get(border, float('inf')) + self.border_trees[area][border][0].get(dst, float('inf'))
+            if distance < best:
+                best, entry = distance, border
+        return best, entry, inner, backbone
+
+    def cost(self, src, dst):
+        return self._route(src, dst)[0]
+
+    # Function to return one shortest path [src, ..., dst], or None when dst is unreachable
+    def path(self, src, dst):
+        cost, entry, inner, backbone = self._route(src, dst)
+        if cost == float('inf'):
+            return None
+        if entry is None:
+            return trace_back(inner[1], dst, src)
+
+        path = trace_back(self.border_trees[self.areas[dst]][entry][1], dst, entry)
+        node = entry
+        previous = backbone[1][node]
+        while previous is not None:
+            if self.areas[previous] == self.areas[node]:  # summary link, expand it
+                path[:1] = trace_back(self.border_trees[self.areas[node]][previous][1], node, previous)
+            else:
+                path.insert(0, previous)
+            node, previous = previous, backbone[1][previous]
+        path[:1] = trace_back(inner[1], node, src)
+        return path
+
+    # Function to return the (distances, previous_nodes) dicts of source over the whole
+    # network, like dijkstra(): every area is searched from the links entering it
+    def tree(self, source):
+        areas, graph = self.areas, self.graph
+        inner, (reach, _) = self._reach(source)
+        distances = {node: float('inf') for node in graph}
+        previous_nodes = {node: None for node in graph}
+        for area, borders in self.borders.items():
+            seeds = {source: (0, None)} if area == areas[source] else {}
+            for border in borders:
+                for neighbor, weight in graph[border]:
+                    if areas[neighbor] != area and neighbor in reach:
+                        distance = reach[neighbor] + weight
+                        if distance < seeds.get(border, (float('inf'),))[0]:
+                            seeds[border] = (distance, neighbor)
+            if seeds:
+                area_distances, area_previous = seeded_dijkstra(graph, seeds, areas, area)
+                distances.update(area_distances)
+                previous_nodes.update(area_previous)
+        return distances, previous_nodes
+
+    def stats(self):
+        return {"areas": len(self.members), "border_routers": len(self.backbone),
+                "backbone_links": sum(len(edges) for edges in self.backbone.values()), **self.counts}
+
+
+# Function to build spf_results like full_spf() from the area mode
+def area_spf(graph, time_changes, areas=None, area_size=DEFAULT_AREA_SIZE):
+    routing = AreaRouting(graph, areas, area_size)
+    spf_results = {}
+    for time in sorted([0] + list(time_changes.keys())):
+        if time > 0:
+            routing.update(time_changes[time])
+        for node in routing.graph:
+            spf_results.setdefault(node, {})[time] = routing.tree(node)
+    return spf_results, routing
+
+# Function to list the (node, time, destination) whose costs differ between two
+# spf_results, e.g. the flat and the area mode
+def compare_spf_results(expected, actual):
+    mismatches = []
+    for node, steps in expected.items():
+        for time, (distances, previous_nodes) in steps.items():
+            other = actual.get(node, {}).get(time, ({}, {}))[0]
+            for dest, cost in distances.items():
+                if other.get(dest, float('inf')) != cost:
+                    mismatches.append((node, time, dest))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SPF over a topology split into areas.")
+    parser.add_argument("input_file")
+    parser.add_argument("--areas", help="file of 'node: area' lines (default: grow areas automatically)")
+    parser.add_argument("--area-size", type=int, default=DEFAULT_AREA_SIZE, help="nodes per automatic area")
+    parser.add_argument("--validate", action="store_true", help="compare every cost with the flat SPF")
+    args = parser.parse_args()
+
+    graph, time_changes = parse_input_file(args.input_file)
+    areas = load_areas(args.areas) if args.areas else None
+    if args.validate:
+        spf_results, routing = area_spf(graph, time_changes, areas, args.area_size)
+        mismatches = compare_spf_results(full_spf(graph, time_changes), spf_results)
+        print(f"{len(mismatches)} costs differ from the flat SPF")
+        for node, time, dest in mismatches[:10]:
+            print(f"  {node} -> {dest} at time {time}")
+    else:
+        routing = AreaRouting(graph, areas, args.area_size)
+        for time in sorted(time_changes):
+            routing.update(time_changes[time])
+    for name, value in routing.stats().items():
+        print(f"{name}\t{value}")
+
+if __name__ == "__main__":
+    main()
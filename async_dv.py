@@ -0,0 +1,212 @@
+import heapq
+
+from dv_history import DeltaHistory
+from failure_events import ANY_NEIGHBOR
+
+# Event-driven distance vector simulation.
+#
+# Instead of lockstep rounds where every node rescans every neighbour's full
+# vector, each node keeps the last vector entries advertised by its neighbours and
+# only sends the entries that changed (triggered updates). Messages travel through
+# one priority queue keyed by simulated tick; a message sent at tick t arrives at
+# t + 1. Work per timestep is proportional to the routes touched by the change.
+#
+# split_horizon: a route is not advertised back to its next hop (the next hop gets
+#   one withdrawal when the route first moves to it, so it never keeps a stale entry)
+# poison_reverse: routes are advertised back to their next hop as unreachable
+# update_interval: triggered updates are held back until the next multiple of it
+# infinity: costs at or above it count as unreachable; defaults to the sum of all
+#   link costs + 1, which no loop-free path can reach, so count-to-infinity ends
+#
+# Each tick that delivered messages is recorded as one step in a DeltaHistory, so
+# the result has the same (time, step, vectors) shape as distance_vector().
+class AsyncDistanceVector:
+    def __init__(self, graph, split_horizon=True, poison_reverse=False, update_interval=1, infinity=None,
+                 max_ticks=1000):
+        self.nodes = list(graph.keys())
+        self.split_horizon = split_horizon
+        self.poison_reverse = poison_reverse
+        self.update_interval = update_interval
+        self.fixed_infinity = infinity
+        self.max_ticks = max_ticks
+
+        # Parallel entries for the same link are kept like in the graph: a change
+        # sets the first one and the cheapest one is used
+        self.parallel = {node: {} for node in self.nodes}
+        for node in self.nodes:
+            for neighbor, cost in graph[node]:
+                self.parallel[node].setdefault(neighbor, []).append(cost)
+        self.links = {node: {neighbor: min(costs) for neighbor, costs in self.parallel[node].items()}
+                      for node in self.nodes}
+        self.routes = {node: {node: (0, None)} for node in self.nodes}
+        self.learned = {node: {} for node in self.nodes}
+        self.advertised_hops = {node: {} for node in self.nodes}
+        self.dirty = {node: {node} for node in self.nodes}
+
+        self.queue = []
+        self.sequence = 0
+        self.tick = 0
+        self.steps = 0
+        self.messages = 0
+        self.pending_deltas = []
+        self.history = DeltaHistory(self.nodes)
+        self.total_cost = sum(cost for links in self.links.values() for cost in links.values()) // 2
+        self.update_infinity()
+
+    def update_infinity(self):
+        self.infinity = self.fixed_infinity if self.fixed_infinity is not None else self.total_cost + 1
+
+    # Function to re-pick the best route of node towards dest from what its
+    # neighbours advertised; the current next hop wins ties
+    def update_route(self, node, dest, deltas):
+        if dest == node:
+            return
+        current = self.routes[node].get(dest)
+        best = None
+        for neighbor, link_cost in self.links[node].items():
+            advertised = self.learned[node].get(neighbor, {}).get(dest)
+            if advertised is None:
+                continue
+            cost = link_cost + advertised
+            if cost >= self.infinity:
+                continue
+            if best is None or cost < best[0] or (cost == best[0] and current is not None and neighbor == current[1]):
+                best = (cost, neighbor)
+
+        if best != current:
+            old_cost = current[0] if current else float('inf')
+            if best is None:
+                del self.routes[node][dest]
+                deltas.append((node, dest, old_cost, float('inf'), None))
+            else:
+                self.routes[node][dest] = best
+                deltas.append((node, dest, old_cost, best[0], best[1]))
+            self.dirty[node].add(dest)
+
+    # Function to handle one update message from sender to node
+    def receive(self, node, sender, entries, deltas):
+        if sender not in self.links[node]:
+            return
+        learned = self.learned[node].setdefault(sender, {})
+        for dest, cost in entries.items():
+            if cost >= self.infinity:
+                learned.pop(dest, None)
+            else:
+                learned[dest] = cost
+            self.update_route(node, dest, deltas)
+
+    # Function to build the entries node advertises to one neighbour
+    def advertisement(self, node, neighbor, dests):
+        entries = {}
+        for dest in dests:
+            route = self.routes[node].get(dest)
+            cost, hop = route if route else (float('inf'), None)
+            if self.split_horizon and hop == neighbor:
+                if self.poison_reverse or self.advertised_hops[node].get(dest) != neighbor:
+                    cost = float('inf')
+                else:
+                    continue
+            entries[dest] = cost
+        return entries
+
+    def send(self, node, neighbor, entries):
+        if entries:
+            self.sequence += 1
+            self.messages += 1
+            heapq.heappush(self.queue, (self.tick + 1, self.sequence, neighbor, node, entries))
+
+    # Function to send the triggered updates of every node with changed routes
+    def send_updates(self):
+        for node, dests in self.dirty.items():
+            if not dests:
+                continue
+            for neighbor in self.links[node]:
+                self.send(node, neighbor, self.advertisement(node, neighbor, dests))
+            for dest in dests:
+                route = self.routes[node].get(dest)
+                self.advertised_hops[node][dest] = route[1] if route else None
+            dests.clear()
+
+    # Function to apply one timestep's (u, v, cost) link changes and failures
+    def apply(self, changes):
+        for u, v, cost in changes:
+            if cost is None:
+                for neighbor in list(self.links.get(u, ())) if v == ANY_NEIGHBOR else [v]:
+                    self.remove_link(u, neighbor)
+                continue
+            if u not in self.links or v not in self.links:
+                raise ValueError(f"Link {u}-{v} refers to a node that is not in the time 0 topology")
+            new_link = v not in self.links[u]
+            old_cost = self.links[u].get(v, 0)
+            for a, b in ((u, v), (v, u)):
+                costs = self.parallel[a].setdefault(b, [cost])
+                costs[0] = cost
+                self.links[a][b] = min(costs)
+            self.total_cost += self.links[u][v] - old_cost
+            self.update_infinity()
+            for a, b in ((u, v), (v, u)):
+                if new_link:
+                    # A new neighbour needs the whole table once
+                    self.send(a, b, self.advertisement(a, b, list(self.routes[a])))
+                for dest in list(self.learned[a].get(b, ())):
+                    self.update_route(a, dest, self.pending_deltas)
+
+    # Function to take a failed link down: routes learned over it are re-picked from
+    # the other neighbours, and only the routes that change are advertised
+    def remove_link(self, u, v):
+        if v not in self.links.get(u, ()):
+            return
+        self.total_cost -= self.links[u][v]
+        self.update_infinity()
+        for a, b in ((u, v), (v, u)):
+            del self.parallel[a][b]
+            del self.links[a][b]
+            for dest in self.learned[a].pop(b, ()):
+                self.update_route(a, dest, self.pending_deltas)
+
+    # Function to deliver messages until the network is quiet (or max_ticks passes)
+    def run(self, time):
+        ticks = 0
+        while ticks < self.max_ticks:
+            if self.tick % self.update_interval == 0:
+                self.send_updates()
+            if not self.queue:
+                if not any(self.dirty.values()):
+                    break
+                self.tick += self.update_interval - self.tick % self.update_interval
+                continue
+
+            self.tick = self.queue[0][0]
+            deltas, self.pending_deltas = self.pending_deltas, []
+            while self.queue and self.queue[0][0] == self.tick:
+                arrival, sequence, node, sender, entries = heapq.heappop(self.queue)
+                self.receive(node, sender, entries, deltas)
+            ticks += 1
+            self.steps += 1
+            self.history.record(time, self.steps, deltas)
+
+        if self.pending_deltas:
+            self.steps += 1
+            self.history.record(time, self.steps, self.pending_deltas)
+            self.pending_deltas = []
+
+    def next_hops(self):
+        return {node: {dest: self.routes[node][dest][1] if dest in self.routes[node] else None
+                       for dest in self.nodes} for node in self.nodes}
+
+    def vectors(self):
+        return {node: {dest: self.routes[node][dest][0] if dest in self.routes[node] else float('inf')
+                       for dest in self.nodes} for node in self.nodes}
+
+
+# Function to run the event-driven distance vector simulation over all timesteps.
+# Changes accumulate, so each timestep builds on the topology of the previous one.
+# Returns (history, next_hops, local_vectors) like distance_vector().
+def distance_vector_async(graph, time_changes, split_horizon=True, poison_reverse=False, update_interval=1,
+                          infinity=None, max_ticks=1000):
+    engine = AsyncDistanceVector(graph, split_horizon, poison_reverse, update_interval, infinity, max_ticks)
+    for current_time in sorted([0] + list(time_changes.keys())):
+        if current_time > 0 and current_time in time_changes:
+            engine.apply(time_changes[current_time])
+        engine.run(current_time)
+    return engine.history, engine.next_hops(), engine.vectors()
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from copy import deepcopy
+
+from compact_graph import CompactGraph
+from stream_parser import load_topology
+from routing_engine import (distance_vector, full_spf, incremental_spf, parse_input_file, write_distance_vector_output,
+                            write_spf_results)
+
+# Batch runner for what-if scenarios that share one base topology.
+#
+# The base file is parsed once in the parent and handed to every worker process
+# when the pool starts. A scenario is only a change stream (a file of "time: u, v,
+# cost" lines, or a {time: [(u, v, cost)]} mapping), applied after the base file's
+# own changes. Each worker copies the base graph, runs SPF and distance vector and
+# writes the results to <output_dir>/<scenario>/. The parent streams one JSON line
+# per finished scenario into manifest.jsonl and writes manifest.json with the totals
+# (including scenarios per minute) at the end.
+#
+# At most `workers` scenarios run at once and at most `max_pending` are queued, so
+# thousands of scenario files are never all loaded up front. A scenario that runs
+# longer than `timeout` seconds is stopped with SIGALRM inside its worker (Unix
+# only; elsewhere the timeout is not enforced).
+
+# Base topology of this worker process: (graph, time_changes)
+worker_base = None
+
+
+class ScenarioTimeout(Exception):
+    pass
+
+
+def _timeout_handler(signum, frame):
+    raise ScenarioTimeout()
+
+def init_worker(graph, time_changes):
+    global worker_base
+    worker_base = (graph, time_changes)
+
+# Function to read a scenario file; lines at time 0 are ignored, the base graph is shared
+def load_scenario(file_path):
+    initial_edges, time_changes = load_topology(file_path)
+    if initial_edges:
+        print(f"{file_path}: time 0 lines are ignored, scenarios only change the base topology")
+    return time_changes
+
+# Function to append a scenario's changes after the base changes of the same time
+def merge_changes(base_changes, scenario_changes):
+    merged = defaultdict(list)
+    for changes in (base_changes, scenario_changes):
+        for change_time in changes:
+            merged[change_time].extend(changes[change_time])
+    return merged
+
+# Function run in the worker processes: one scenario from base graph to output files
+def run_scenario(name, scenario, output_dir, options, timeout=None):
+    start = time.perf_counter()
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _timeout_handler)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        base_graph, base_changes = worker_base
+        scenario_changes = load_scenario(scenario) if isinstance(scenario, str) else scenario
+        time_changes = merge_changes(base_changes, scenario_changes)
+
+        graph = deepcopy(base_graph)
+        if options.get("compact"):
+            graph = CompactGraph.from_adjacency(graph)
+        dv_history, next_hops, _ = distance_vector(graph, time_changes, backend=options.get("dv_backend", "python"))
+        if options.get("incremental", True):
+            spf_results = incremental_spf(graph, time_changes)
+        else:
+            spf_results = full_spf(graph, time_changes)
+
+        files = 0
+        if output_dir is not None:
+            scenario_dir = os.path.join(output_dir, name)
+            os.makedirs(scenario_dir, exist_ok=True)
+            output_file = os.path.join(scenario_dir, f"{name}.txt")
+            table = options.get("table", False)
+            write_spf_results(output_file, spf_results, table)
+            write_distance_vector_output(output_file, dv_history, next_hops, table)
+            files = len(os.listdir(scenario_dir))
+        status, error = "ok", None
+        steps = len(dv_history)
+    except ScenarioTimeout:
+        status, error, steps, files = "timeout", f"stopped after {timeout}s", None, 0
+    except Exception as e:
+        status, error, steps, files = "error", f"{type(e).__name__}: {e}", None, 0
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    return {"scenario": name, "status": status, "error": error, "seconds": round(time.perf_counter() - start, 6),
+            "timesteps": None if steps is None else len(time_changes) + 1, "dv_steps": steps, "files": files}
+
+# Function to run every scenario against the base topology. scenarios maps a name to
+# a change file path or a {time: [(u, v, cost)]} mapping. Returns the manifest.
+def run_batch(base_file, scenarios, output_dir, workers=None, max_pending=None, timeout=None, incremental=True,
+              compact=False, dv_backend="python", table=False):
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or 2 * workers
+    options = {"incremental": incremental, "compact": compact, "dv_backend": dv_backend, "table": table}
+
+    # The pool gets plain dicts: a graph mapped from a binary file cannot be pickled
+    graph, time_changes = parse_input_file(base_file)
+    graph, time_changes = dict(graph), {time: list(time_changes[time]) for time in time_changes}
+
+    os.makedirs(output_dir, exist_ok=True)
+    counts = defaultdict(int)
+    start = time.perf_counter()
+    scenario_items = iter(scenarios.items())
+    with open(os.path.join(output_dir, "manifest.jsonl"), "w") as manifest_lines, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                initargs=(graph, time_changes)) as executor:
+        pending = set()
+        while True:
+            for name, scenario in scenario_items:
+                pending.add(executor.submit(run_scenario, name, scenario, output_dir, options, timeout))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                counts[result["status"]] += 1
+                manifest_lines.write(json.dumps(result) + "\n")
+                manifest_lines.flush()
+
+    seconds = time.perf_counter() - start
+    finished = sum(counts.values())
+    manifest = {
+        "base": base_file,
+        "output_dir": output_dir,
+        "options": options,
+        "workers": workers,
+        "timeout": timeout,
+        "scenarios": finished,
+        "ok": counts["ok"],
+        "timed_out": counts["timeout"],
+        "errors": counts["error"],
+        "seconds": round(seconds, 3),
+        "scenarios_per_minute": round(finished * 60 / seconds, 1) if seconds else None,
+        "results": "manifest.jsonl",
+    }
+    with open(os.path.join(output_dir, "manifest.json"), "w") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Run what-if change streams against one base topology.")
+    parser.add_argument("base", help="base topology (text or .bin)")
+    parser.add_argument("scenarios", nargs="+", help="scenario change files (time: u, v, cost lines)")
+    parser.add_argument("--output-dir", default="batch_output")
+    parser.add_argument("--workers", type=int, default=None, help="scenarios run at once (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None, help="scenarios queued ahead of the workers")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per scenario")
+    parser.add_argument("--full-spf", action="store_true", help="recompute SPF at every timestep")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--dv-backend", default="python", choices=["python", "numpy", "async"])
+    parser.add_argument("--table", action="store_true", help="one SPF and one DV table per scenario")
+    args = parser.parse_args()
+
+    scenarios = {}
+    for file_path in args.scenarios:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        if name in scenarios:
+            parser.error(f"two scenario files are named {name}")
+        scenarios[name] = file_path
+
+    manifest = run_batch(args.base, scenarios, args.output_dir, args.workers, args.max_pending, args.timeout,
+                         not args.full_spf, args.compact, args.dv_backend, args.table)
+    print(f"{manifest['scenarios']} scenarios ({manifest['ok']} ok, {manifest['timed_out']} timed out, "
+          f"{manifest['errors']} failed) in {manifest['seconds']}s, "
+          f"{manifest['scenarios_per_minute']} scenarios/min")
+    if manifest["ok"] != manifest["scenarios"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from area_routing import AreaRouting
+from topologies import change_stream, grid, random_geometric
+from routing_engine import dijkstra, update_link
+
+# Function to time run() over the items, in milliseconds per item
+def mean_ms(run, items):
+    start = time.perf_counter()
+    for item in items:
+        run(item)
+    return (time.perf_counter() - start) * 1000 / len(items)
+
+# A flat network has to rerun SPF from every node on each event; the area mode only
+# recomputes the border trees of the area hit. "flat SPF" is one source's share of
+# the flat recompute, the area queries answer one src-dst cost each.
+def main(num_nodes=20000, area_size=500, num_events=20, num_queries=20):
+    print(f"nodes={num_nodes} area size={area_size} events={num_events} queries={num_queries}")
+    print("topology\tsetup(s)\tareas\tborder routers\tflat SPF(ms)\tarea update(ms)\tarea query(ms)")
+    for generator in (grid, random_geometric):
+        links = generator(num_nodes)
+        graph = defaultdict(list)
+        for u, v, cost in links:
+            graph[u].append((v, cost))
+            graph[v].append((u, cost))
+        time_changes = change_stream(links, num_events)
+        rng = random.Random(1)
+        pairs = [tuple(rng.sample(list(graph), 2)) for _ in range(num_queries)]
+
+        start = time.perf_counter()
+        routing = AreaRouting(graph, area_size=area_size)
+        setup = time.perf_counter() - start
+        stats = routing.stats()
+
+        flat = mean_ms(lambda pair: dijkstra(graph, pair[0]), pairs[:5])
+        update = mean_ms(routing.update, [time_changes[time] for time in sorted(time_changes)])
+        query = mean_ms(lambda pair: routing.cost(*pair), pairs)
+
+        for time_step in sorted(time_changes):
+            for u, v, cost in time_changes[time_step]:
+                update_link(graph, u, v, cost)
+        for src, dst in pairs[:5]:
+            assert routing.cost(src, dst) == dijkstra(graph, src)[0][dst], "area routing diverged from dijkstra()"
+        print(f"{generator.__name__}\t{setup:.1f}\t{stats['areas']}\t{stats['border_routers']}"
+              f"\t{flat:.1f}\t{update:.1f}\t{query:.1f}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from compact_graph import CompactGraph, dijkstra_ids
+from topologies import barabasi_albert, grid
+from bucket_queue import max_link_cost
+from routing_engine import dijkstra
+
+# Function to time run() over the sources, in seconds per SPF
+def mean_seconds(run, sources):
+    start = time.perf_counter()
+    for source in sources:
+        run(source)
+    return (time.perf_counter() - start) / len(sources)
+
+# max_cost=inf makes dijkstra() and dijkstra_ids() keep the binary heap; the bucket
+# runs get the largest cost up front, as the SPF loops of routing_engine do
+def main(max_cost=1000, num_sources=3, *sizes):
+    inf = float('inf')
+    print(f"max cost={max_cost} sources={num_sources}")
+    print("topology\tnodes\theap(s)\tbuckets(s)\tspeedup\theap ids(s)\tbuckets ids(s)\tspeedup")
+    for generator in (grid, barabasi_albert):
+        for num_nodes in sizes or (10000, 100000, 1000000):
+            graph = defaultdict(list)
+            for u, v, cost in generator(num_nodes, max_cost=max_cost):
+                graph[u].append((v, cost))
+                graph[v].append((u, cost))
+            compact = CompactGraph.from_adjacency(graph)
+            nodes = list(graph)
+            sources = nodes[::len(nodes) // num_sources][:num_sources]
+            ids = [compact.ids[source] for source in sources]
+
+            heap = mean_seconds(lambda source: dijkstra(graph, source, inf), sources)
+            graph_cost = max_link_cost(graph)
+            buckets = mean_seconds(lambda source: dijkstra(graph, source, graph_cost), sources)
+            heap_ids = mean_seconds(lambda source: dijkstra_ids(compact, source, inf), ids)
+            buckets_ids = mean_seconds(lambda source: dijkstra_ids(compact, source), ids)
+
+            assert dijkstra(graph, sources[0], inf) == dijkstra(graph, sources[0]), \
+                "bucket SPF diverged from dijkstra()"
+            print(f"{generator.__name__}\t{num_nodes}\t{heap:.3f}\t{buckets:.3f}\t{heap / buckets:.2f}x"
+                  f"\t{heap_ids:.3f}\t{buckets_ids:.3f}\t{heap_ids / buckets_ids:.2f}x")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from compact_graph import CompactGraph, dijkstra_ids
+from routing_engine import dijkstra
+
+# Function to build a random dict-of-lists topology like parse_input_file does
+def build_adjacency(num_nodes, num_links, seed=1):
+    rng = random.Random(seed)
+    graph = defaultdict(list)
+    for i in range(1, num_nodes):
+        u, v, cost = f"R{rng.randrange(i)}", f"R{i}", rng.randint(1, 100)
+        graph[u].append((v, cost))
+        graph[v].append((u, cost))
+    for _ in range(num_links - (num_nodes - 1)):
+        u, v, cost = f"R{rng.randrange(num_nodes)}", f"R{rng.randrange(num_nodes)}", rng.randint(1, 100)
+        graph[u].append((v, cost))
+        graph[v].append((u, cost))
+    return graph
+
+# Function to measure the memory allocated while building a graph
+def measure(build):
+    tracemalloc.start()
+    graph = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, size
+
+def main(num_nodes=100000, num_links=500000):
+    adjacency, adjacency_bytes = measure(lambda: build_adjacency(num_nodes, num_links))
+    compact, compact_bytes = measure(lambda: CompactGraph.from_adjacency(adjacency))
+    num_edges = len(compact.neighbors)
+    print(f"nodes={num_nodes} edges={num_edges}")
+    print(f"dict-of-lists: {adjacency_bytes / num_edges:.1f} bytes/edge")
+    print(f"compact (incl. name table): {compact_bytes / num_edges:.1f} bytes/edge, "
+          f"arrays only: {compact.nbytes() / num_edges:.1f} bytes/edge")
+
+    source = "R0"
+    start = time.perf_counter()
+    dijkstra(adjacency, source)
+    print(f"dijkstra dict-of-lists: {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    dijkstra(compact, source)
+    print(f"dijkstra compact (name-keyed result): {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    dijkstra_ids(compact, compact.ids[source])
+    print(f"dijkstra compact (ID arrays): {time.perf_counter() - start:.3f}s")
+
+    start = time.perf_counter()
+    index_bytes = measure(compact._index)[1]
+    print(f"edge index for O(1) updates: {index_bytes / num_edges:.1f} bytes/edge, "
+          f"built in {time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,64 @@
+import os
+import random
+import sys
+import time
+from copy import deepcopy
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from routing_engine import apply_time_changes, dijkstra, incremental_spf
+
+# Function to build a random connected topology with single-link change events
+def build_topology(num_nodes, degree, num_events, seed=1):
+    rng = random.Random(seed)
+    nodes = [f"R{i}" for i in range(num_nodes)]
+    graph = defaultdict(list)
+    links = set()
+    for i in range(1, num_nodes):
+        links.add((nodes[rng.randrange(i)], nodes[i]))
+    while len(links) < num_nodes * degree // 2:
+        u, v = rng.sample(nodes, 2)
+        if (v, u) not in links:
+            links.add((u, v))
+    for u, v in links:
+        cost = rng.randint(1, 20)
+        graph[u].append((v, cost))
+        graph[v].append((u, cost))
+
+    links = sorted(links)
+    time_changes = defaultdict(list)
+    for time in range(1, num_events + 1):
+        u, v = rng.choice(links)
+        time_changes[time].append((u, v, rng.randint(1, 20)))
+    return graph, time_changes
+
+# Function to time the original full-recompute SPF loop from main()
+def run_full(graph, time_changes):
+    spf_results = {node: {} for node in graph}
+    for time in sorted([0] + list(time_changes.keys())):
+        if time > 0:
+            apply_time_changes(graph, time_changes, time)
+        for node in graph:
+            spf_results[node][time] = dijkstra(graph, node)
+    return spf_results
+
+def main(num_nodes=200, degree=4):
+    print(f"nodes={num_nodes} degree={degree}")
+    print("events\tfull(s)\tincremental(s)\tspeedup")
+    for num_events in (1, 10, 50, 100, 200):
+        graph, time_changes = build_topology(num_nodes, degree, num_events)
+
+        start = time.perf_counter()
+        full = run_full(deepcopy(graph), time_changes)
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        incremental = incremental_spf(deepcopy(graph), time_changes)
+        incremental_time = time.perf_counter() - start
+
+        assert full == incremental, "incremental SPF diverged from full recompute"
+        print(f"{num_events}\t{full_time:.3f}\t{incremental_time:.3f}\t{full_time / incremental_time:.1f}x")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
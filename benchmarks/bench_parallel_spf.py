@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+from copy import deepcopy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_incremental_spf import build_topology, run_full
+from parallel_spf import parallel_spf
+
+# Usage: bench_parallel_spf.py [nodes] [events] [worker counts...]
+# Worker counts above the number of cores are skipped.
+def main(num_nodes=1000, num_events=5, *worker_counts):
+    worker_counts = worker_counts or (1, 2, 4, 8, 16, 32)
+    graph, time_changes = build_topology(num_nodes, 4, num_events)
+
+    start = time.perf_counter()
+    serial = run_full(deepcopy(graph), time_changes)
+    serial_time = time.perf_counter() - start
+    print(f"nodes={num_nodes} timesteps={num_events + 1} cores={os.cpu_count()}")
+    print("workers\ttime(s)\tspeedup")
+    print(f"serial\t{serial_time:.3f}\t1.0x")
+
+    for workers in worker_counts:
+        if workers > os.cpu_count():
+            continue
+        start = time.perf_counter()
+        parallel = parallel_spf(deepcopy(graph), time_changes, workers)
+        parallel_time = time.perf_counter() - start
+        assert parallel == serial, "parallel SPF diverged from the serial loop"
+        print(f"{workers}\t{parallel_time:.3f}\t{serial_time / parallel_time:.1f}x")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,46 @@
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from path_query import PathQuery
+from topologies import barabasi_albert, grid
+from routing_engine import dijkstra
+
+# Function to time the mean of run() over the query pairs, in milliseconds
+def mean_ms(run, pairs):
+    start = time.perf_counter()
+    for src, dst in pairs:
+        run(src, dst)
+    return (time.perf_counter() - start) * 1000 / len(pairs)
+
+def main(num_nodes=100000, num_queries=50, num_landmarks=16):
+    print(f"nodes={num_nodes} queries={num_queries} landmarks={num_landmarks}")
+    print("topology\tfull tree(ms)\tbidirectional(ms)\tALT setup(s)\tbidirectional+ALT(ms)")
+    for generator in (grid, barabasi_albert):
+        graph = defaultdict(list)
+        for u, v, cost in generator(num_nodes):
+            graph[u].append((v, cost))
+            graph[v].append((u, cost))
+        rng = random.Random(1)
+        nodes = list(graph)
+        pairs = [tuple(rng.sample(nodes, 2)) for _ in range(num_queries)]
+
+        full = mean_ms(lambda src, dst: dijkstra(graph, src), pairs[:5])
+        plain = PathQuery(graph)
+        bidirectional = mean_ms(lambda src, dst: plain.shortest_path(0, src, dst), pairs)
+        start = time.perf_counter()
+        landmarks = PathQuery(graph, landmarks=num_landmarks)
+        setup = time.perf_counter() - start
+        alt = mean_ms(lambda src, dst: landmarks.shortest_path(0, src, dst), pairs)
+
+        for src, dst in pairs[:5]:
+            assert plain.shortest_path(0, src, dst)[0] == landmarks.shortest_path(0, src, dst)[0] == \
+                dijkstra(graph, src)[0][dst], "point-to-point query diverged from dijkstra()"
+        print(f"{generator.__name__}\t{full:.1f}\t{bidirectional:.1f}\t{setup:.1f}\t{alt:.1f}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from routing_engine import distance_vector, parse_input_file, write_distance_vector_output, write_spf_results
+from bench_incremental_spf import run_full
+from topologies import GENERATORS, change_stream, write_topology
+
+# Benchmark suite: generates each synthetic topology, then times the phases of
+# Vectors.main() one by one (parsing, the SPF loop, distance_vector and both
+# writers) and reports seconds, throughput and peak traced memory per phase as JSON.
+# Every phase runs once untraced for the time and once under tracemalloc for the
+# peak memory, since tracing slows Python code down several times.
+
+
+# Function to run one phase for its time and (optionally) its peak memory
+def measure(phase, memory=True):
+    start = time.perf_counter()
+    result = phase()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        phase()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, {"seconds": round(seconds, 6), "peak_bytes": peak}
+
+def throughput(stats, count, unit):
+    stats["throughput"] = round(count / stats["seconds"], 1) if stats["seconds"] else None
+    stats["unit"] = unit
+    return stats
+
+# Function to count the rounds distance_vector needed at each timestep: the rounds up
+# to the last one that changed a vector, without the stable rounds that follow
+def steps_to_converge(history):
+    steps = {}
+    for i, (current_time, step, reset, by_node) in enumerate(history.steps):
+        counted = steps.setdefault(current_time, [0, 0])
+        counted[0] += 1
+        if by_node:
+            counted[1] = counted[0]
+    return {current_time: changing for current_time, (rounds, changing) in steps.items()}
+
+def directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+# Function to benchmark every phase on one generated topology
+def run_case(name, num_nodes, num_events, changes_per_event, flap, seed, memory, work_dir):
+    links = GENERATORS[name](num_nodes, seed=seed)
+    time_changes = change_stream(links, num_events, changes_per_event, flap=flap, seed=seed)
+    input_file = os.path.join(work_dir, f"{name}.txt")
+    write_topology(input_file, links, time_changes)
+    input_lines = len(links) + sum(len(changes) for changes in time_changes.values())
+
+    (graph, time_changes), parse = measure(lambda: parse_input_file(input_file), memory)
+    timesteps = len(time_changes) + 1
+    sources = len(graph)
+
+    spf_results, spf = measure(lambda: run_full(deepcopy(graph), time_changes), memory)
+    (history, next_hops, _), dv = measure(lambda: distance_vector(deepcopy(graph), time_changes), memory)
+
+    output_dir = os.path.join(work_dir, name)
+    os.makedirs(output_dir)
+    output_file = os.path.join(output_dir, "topology.txt")
+    _, spf_writer = measure(lambda: write_spf_results(output_file, spf_results), memory)
+    spf_bytes = directory_size(output_dir)
+    _, dv_writer = measure(lambda: write_distance_vector_output(output_file, history, next_hops), memory)
+    dv_bytes = directory_size(output_dir) - spf_bytes
+
+    rounds = steps_to_converge(history)
+    return {
+        "topology": name,
+        "nodes": sources,
+        "links": len(links),
+        "timesteps": timesteps,
+        "changes": input_lines - len(links),
+        "phases": {
+            "parse": throughput(parse, input_lines, "lines/s"),
+            "spf": throughput(spf, sources * timesteps, "trees/s"),
+            "distance_vector": throughput(dv, len(history), "rounds/s"),
+            "write_spf": throughput(spf_writer, spf_bytes, "bytes/s"),
+            "write_distance_vector": throughput(dv_writer, dv_bytes, "bytes/s"),
+        },
+        "dv_rounds": len(history),
+        "steps_to_converge": {str(current_time): count for current_time, count in rounds.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time parsing, SPF, distance vector and the writers on "
+                                                 "synthetic topologies and report the results as JSON.")
+    parser.add_argument("--topologies", default=",".join(GENERATORS),
+                        help=f"comma separated, from: {', '.join(GENERATORS)}")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[50],
+                        help="approximate node counts (fat_tree rounds up to a whole tree)")
+    parser.add_argument("--events", type=int, default=10, help="timestamps with changes")
+    parser.add_argument("--changes", type=int, default=1, help="link changes per timestamp")
+    parser.add_argument("--flap", action="store_true", help="every other timestamp restores the previous change")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    names = args.topologies.split(",")
+    for name in names:
+        if name not in GENERATORS:
+            parser.error(f"unknown topology {name}")
+
+    results = []
+    for num_nodes in args.nodes:
+        for name in names:
+            with tempfile.TemporaryDirectory() as work_dir:
+                results.append(run_case(name, num_nodes, args.events, args.changes, args.flap, args.seed,
+                                        not args.no_memory, work_dir))
+            print(f"{name} nodes={results[-1]['nodes']} done", file=sys.stderr)
+
+    report = {"config": vars(args), "results": results}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
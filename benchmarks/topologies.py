@@ -0,0 +1,135 @@
+import math
+import random
+from collections import defaultdict
+
+# Reproducible synthetic topologies for the benchmarks. Every generator returns a
+# list of (u, v, cost) links; change_stream() adds timed cost changes and
+# write_topology() saves both in the "time: u, v, cost" input format.
+
+
+# Function to connect a random geometric graph: nodes in the unit square, linked
+# when closer than radius, cost growing with the distance
+def random_geometric(num_nodes, radius=None, max_cost=20, seed=1):
+    rng = random.Random(seed)
+    radius = radius or math.sqrt(8 / (math.pi * num_nodes))
+    points = [(rng.random(), rng.random()) for _ in range(num_nodes)]
+    parent = list(range(num_nodes))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def cost(i, j):
+        return max(1, math.ceil(math.dist(points[i], points[j]) / radius * max_cost))
+
+    links = []
+    for i in range(num_nodes):
+        for j in range(i + 1, num_nodes):
+            if math.dist(points[i], points[j]) < radius:
+                links.append((f"G{i}", f"G{j}", cost(i, j)))
+                parent[find(i)] = find(j)
+
+    # Join any leftover component to its nearest node in the rest of the graph
+    for i in range(1, num_nodes):
+        if find(i) != find(0):
+            j = min((j for j in range(num_nodes) if find(j) != find(i)), key=lambda j: math.dist(points[i], points[j]))
+            links.append((f"G{j}", f"G{i}", cost(i, j)))
+            parent[find(i)] = find(j)
+    return links
+
+# Function to grow a Barabási–Albert graph: each new node attaches to m existing
+# nodes picked proportionally to their degree
+def barabasi_albert(num_nodes, m=2, max_cost=20, seed=1):
+    rng = random.Random(seed)
+    links = []
+    ends = []
+    for i in range(1, m + 1):
+        links.append(("B0", f"B{i}", rng.randint(1, max_cost)))
+        ends.extend((0, i))
+    for i in range(m + 1, num_nodes):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rng.choice(ends))
+        for j in sorted(targets):
+            links.append((f"B{j}", f"B{i}", rng.randint(1, max_cost)))
+            ends.extend((j, i))
+    return links
+
+# Function to build a rows x cols grid
+def grid(num_nodes, max_cost=20, seed=1):
+    rng = random.Random(seed)
+    cols = max(1, math.isqrt(num_nodes))
+    rows = math.ceil(num_nodes / cols)
+    links = []
+    for i in range(num_nodes):
+        row, col = divmod(i, cols)
+        if col + 1 < cols and i + 1 < num_nodes:
+            links.append((f"X{row}_{col}", f"X{row}_{col + 1}", rng.randint(1, max_cost)))
+        if row + 1 < rows and i + cols < num_nodes:
+            links.append((f"X{row}_{col}", f"X{row + 1}_{col}", rng.randint(1, max_cost)))
+    return links
+
+# Function to build the switches of a k-ary fat-tree: (k/2)² core switches and k pods
+# of k/2 aggregation and k/2 edge switches, 5k²/4 nodes in total. k is the smallest
+# even number that reaches num_nodes.
+def fat_tree(num_nodes, max_cost=20, seed=1):
+    rng = random.Random(seed)
+    k = 2
+    while 5 * k * k // 4 < num_nodes:
+        k += 2
+    half = k // 2
+    links = []
+    for pod in range(k):
+        for a in range(half):
+            for c in range(half):
+                links.append((f"C{a * half + c}", f"A{pod}_{a}", rng.randint(1, max_cost)))
+            for e in range(half):
+                links.append((f"A{pod}_{a}", f"E{pod}_{e}", rng.randint(1, max_cost)))
+    return links
+
+# Function to build a ring
+def ring(num_nodes, max_cost=20, seed=1):
+    rng = random.Random(seed)
+    return [(f"N{i}", f"N{(i + 1) % num_nodes}", rng.randint(1, max_cost)) for i in range(num_nodes)]
+
+GENERATORS = {
+    "geometric": random_geometric,
+    "barabasi_albert": barabasi_albert,
+    "grid": grid,
+    "fat_tree": fat_tree,
+    "ring": ring,
+}
+
+
+# Function to pick cost changes on existing links: num_events timestamps with
+# changes_per_event changes each. With flap=True every other timestamp restores
+# the costs changed by the one before, like a link going down and up again.
+def change_stream(links, num_events, changes_per_event=1, max_cost=20, flap=False, seed=1):
+    rng = random.Random(seed)
+    costs = {(u, v): cost for u, v, cost in links}
+    time_changes = defaultdict(list)
+    previous = []
+    for time in range(1, num_events + 1):
+        if flap and previous:
+            time_changes[time] = [(u, v, old) for u, v, old, new in previous]
+            for u, v, old, new in previous:
+                costs[(u, v)] = old
+            previous = []
+            continue
+        for u, v in rng.sample(sorted(costs), min(changes_per_event, len(costs))):
+            new_cost = rng.randint(1, max_cost)
+            time_changes[time].append((u, v, new_cost))
+            previous.append((u, v, costs[(u, v)], new_cost))
+            costs[(u, v)] = new_cost
+        if not flap:
+            previous = []
+    return time_changes
+
+# Function to write links and changes in the "time: u, v, cost" input format
+def write_topology(file_path, links, time_changes):
+    with open(file_path, "w") as file:
+        file.write("".join(f"0: {u}, {v}, {cost}\n" for u, v, cost in links))
+        for time in sorted(time_changes):
+            file.write("".join(f"{time}: {u}, {v}, {cost}\n" for u, v, cost in time_changes[time]))
@@ -0,0 +1,224 @@
+import mmap
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+
+from compact_graph import CompactGraph
+from stream_parser import load_topology
+
+# Binary topology file (little-endian), sections 8-byte aligned in this order:
+#   name_offsets  int64[name_count + 1]     offsets into names_blob
+#   names_blob    utf-8                     every node name, sorted
+#   graph_ids     int32[graph_nodes]        name ID of each row of the time 0 graph
+#   graph_order   int32[graph_nodes]        rows in key (first appearance) order
+#   csr_offsets   int64[graph_nodes + 1]    CSR of the time 0 graph, as in CompactGraph
+#   csr_neighbors int32[edge_count]
+#   csr_weights   int32[edge_count]
+#   index_times   int64[time_count]         timestamps of the change list, ascending
+#   index_starts  int64[time_count + 1]     first event record of each timestamp
+#   events        int32[event_count * 3]    (u name ID, v name ID, cost) records; a
+#                                           failure (cost None) is stored as FAILED_COST
+MAGIC = b'NRSB'
+VERSION = 1
+BINARY_SUFFIX = '.bin'
+HEADER = struct.Struct('<4sI7Q')
+FAILED_COST = -2 ** 31
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+# Function to compute where every section starts from the header counts
+def _layout(name_count, names_size, graph_nodes, edge_count, time_count, event_count):
+    sizes = [
+        ('name_offsets', 8 * (name_count + 1)),
+        ('names_blob', names_size),
+        ('graph_ids', 4 * graph_nodes),
+        ('graph_order', 4 * graph_nodes),
+        ('csr_offsets', 8 * (graph_nodes + 1)),
+        ('csr_neighbors', 4 * edge_count),
+        ('csr_weights', 4 * edge_count),
+        ('index_times', 8 * time_count),
+        ('index_starts', 8 * (time_count + 1)),
+        ('events', 12 * event_count),
+    ]
+    layout = {}
+    offset = _align(HEADER.size)
+    for name, size in sizes:
+        layout[name] = (offset, size)
+        offset = _align(offset + size)
+    return layout, offset
+
+
+def _little_endian(values):
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+# Function to pack a topology (dict-of-lists or CompactGraph plus its change list)
+# into the bytes of a binary topology file
+def pack_topology(initial_edges, time_changes):
+    if isinstance(initial_edges, CompactGraph):
+        graph = initial_edges
+    else:
+        graph = CompactGraph.from_adjacency(initial_edges)
+    names = set(graph.names)
+    for changes in time_changes.values():
+        for u, v, cost in changes:
+            names.update((u, v))
+    names = sorted(names)
+    ids = {name: i for i, name in enumerate(names)}
+
+    blob = bytearray()
+    name_offsets = array('q', [0])
+    for name in names:
+        blob += name.encode('utf-8')
+        name_offsets.append(len(blob))
+
+    times = sorted(time_changes)
+    index_starts = array('q', [0])
+    events = array('i')
+    for time in times:
+        for u, v, cost in time_changes[time]:
+            events.extend((ids[u], ids[v], FAILED_COST if cost is None else cost))
+        index_starts.append(len(events) // 3)
+
+    offsets, neighbors, weights = graph.csr()
+    sections = {
+        'name_offsets': _little_endian(name_offsets),
+        'names_blob': bytes(blob),
+        'graph_ids': _little_endian(array('i', (ids[name] for name in graph.names))),
+        'graph_order': _little_endian(graph.order),
+        'csr_offsets': _little_endian(offsets),
+        'csr_neighbors': _little_endian(neighbors),
+        'csr_weights': _little_endian(weights),
+        'index_times': _little_endian(array('q', times)),
+        'index_starts': _little_endian(index_starts),
+        'events': _little_endian(events),
+    }
+    counts = (len(names), len(blob), len(graph.names), len(neighbors), len(times), len(events) // 3)
+    layout, total_size = _layout(*counts)
+
+    data = bytearray(total_size)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, *counts, total_size)
+    for name, (offset, size) in layout.items():
+        data[offset:offset + size] = sections[name]
+    return data
+
+# Function to write a parsed topology to the binary format
+def write_binary_topology(binary_path, initial_edges, time_changes):
+    with open(binary_path, 'wb') as file:
+        file.write(pack_topology(initial_edges, time_changes))
+
+# Function to convert a text topology ("time: u, v, cost") to the binary format
+def convert_text_to_binary(text_path, binary_path):
+    initial_edges, time_changes = load_topology(text_path)
+    write_binary_topology(binary_path, initial_edges, time_changes)
+
+
+# Binary topology over any writable buffer (a memory-mapped file, shared memory).
+# The time 0 graph is a CompactGraph whose arrays are views straight into the
+# buffer, and events for a timestamp are found through the index in O(1).
+class BinaryTopology:
+    def __init__(self, buffer, source="buffer"):
+        if sys.byteorder != 'little':
+            raise RuntimeError("Binary topologies are only mapped on little-endian machines")
+        magic, version, *counts, total_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{source} is not a version {VERSION} binary topology")
+        layout, expected_size = _layout(*counts)
+        if total_size != expected_size or len(buffer) < total_size:
+            raise ValueError(f"{source} is truncated")
+
+        view = memoryview(buffer)
+        typecodes = {'name_offsets': 'q', 'graph_ids': 'i', 'graph_order': 'i', 'csr_offsets': 'q',
+                     'csr_neighbors': 'i', 'csr_weights': 'i', 'index_times': 'q', 'index_starts': 'q',
+                     'events': 'i'}
+        self.sections = {}
+        for name, (offset, size) in layout.items():
+            section = view[offset:offset + size]
+            self.sections[name] = section.cast(typecodes[name]) if name in typecodes else section
+
+        name_offsets, blob = self.sections['name_offsets'], self.sections['names_blob']
+        self.names = [bytes(blob[name_offsets[i]:name_offsets[i + 1]]).decode('utf-8')
+                      for i in range(len(name_offsets) - 1)]
+        self.index = {time: i for i, time in enumerate(self.sections['index_times'])}
+
+    # Function to map a binary topology file copy-on-write, so link updates made
+    # through the views never touch the file
+    @classmethod
+    def open(cls, binary_path):
+        with open(binary_path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        return cls(buffer, binary_path)
+
+    # Function to drop every view into the buffer so it can be closed
+    def release(self):
+        for section in self.sections.values():
+            section.release()
+        self.sections = {}
+
+    # Function to return the time 0 graph without copying its arrays
+    def graph(self):
+        names = self.names
+        return CompactGraph.from_csr([names[i] for i in self.sections['graph_ids']], self.sections['graph_order'],
+                                     self.sections['csr_offsets'], self.sections['csr_neighbors'],
+                                     self.sections['csr_weights'])
+
+    # Function to return the raw int32 (u, v, cost) records of one timestamp
+    def event_records(self, time):
+        i = self.index.get(time)
+        if i is None:
+            return self.sections['events'][0:0]
+        starts = self.sections['index_starts']
+        return self.sections['events'][3 * starts[i]:3 * starts[i + 1]]
+
+    # Function to return the changes of one timestamp as (u, v, cost) tuples
+    def events_at(self, time):
+        records = self.event_records(time)
+        names = self.names
+        return [(names[records[i]], names[records[i + 1]], records[i + 2] if records[i + 2] != FAILED_COST else None)
+                for i in range(0, len(records), 3)]
+
+    def times(self):
+        return list(self.sections['index_times'])
+
+
+# The change list of a BinaryTopology as a read-only {time: [(u, v, cost)]} mapping,
+# decoded on access so nothing is read until a timestep asks for it
+class BinaryTimeChanges(Mapping):
+    def __init__(self, topology):
+        self.topology = topology
+
+    def __getitem__(self, time):
+        if time not in self.topology.index:
+            raise KeyError(time)
+        return self.topology.events_at(time)
+
+    def __iter__(self):
+        return iter(self.topology.index)
+
+    def __len__(self):
+        return len(self.topology.index)
+
+    def __contains__(self, time):
+        return time in self.topology.index
+
+# Function to load a binary topology in the (graph, time_changes) shape returned by
+# parse_input_file. With compact=False the graph is copied into a defaultdict(list).
+def load_binary_topology(binary_path, compact=True):
+    topology = BinaryTopology.open(binary_path)
+    graph = topology.graph()
+    if not compact:
+        graph = defaultdict(list, {node: graph[node] for node in graph})
+    return graph, BinaryTimeChanges(topology)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} topology.txt topology{BINARY_SUFFIX}")
+        sys.exit(1)
+    convert_text_to_binary(sys.argv[1], sys.argv[2])
@@ -0,0 +1,135 @@
+from itertools import chain
+from operator import itemgetter
+
+from instrumentation import heap_functions, trace_spf
+
+# Dijkstra with a bucket queue (Dial's algorithm) for small integer link costs.
+#
+# parse_input_file() always reads costs as ints and real topologies use small ones,
+# so instead of one binary heap of (distance, node) entries the nodes waiting to be
+# settled sit in max_cost + 1 buckets, one per distance modulo max_cost + 1. Every
+# tentative distance lies within max_cost of the one being settled, so the buckets
+# never mix two distances and the queue only ever walks forward through them.
+#
+# Inside a bucket the nodes are popped smallest first (a small heap of names, or of
+# IDs for CompactGraph, whose IDs follow the sorted names). That is the order the
+# (distance, node) heap of dijkstra() pops ties in, so distances and predecessors
+# are identical to dijkstra(), ties and zero-cost links included. With tracing on,
+# the appends to the buckets count as heap pushes and the pops as heap pops, like
+# the entries of dijkstra()'s heap.
+#
+# dijkstra() and dijkstra_ids() switch to these kernels by themselves when every
+# cost is a non-negative int of at most BUCKET_MAX_COST and the graph has more nodes
+# than that (below it, setting up the buckets costs more than the heap it replaces);
+# anything else keeps the binary heap.
+
+# Largest link cost the bucket queue is used for
+BUCKET_MAX_COST = 1000
+
+
+# Function to return the largest link cost of a name-keyed graph, or inf when a cost
+# is not a non-negative int (the bucket queue cannot be used)
+def max_link_cost(graph):
+    costs = set(map(itemgetter(1), chain.from_iterable(graph.values())))
+    if not all(type(cost) is int and cost >= 0 for cost in costs):
+        return float('inf')
+    return max(costs, default=0)
+
+# Function to tell whether a graph of num_nodes nodes with that largest cost should
+# use the bucket queue
+def use_buckets(max_cost, num_nodes):
+    return max_cost <= BUCKET_MAX_COST and max_cost < num_nodes
+
+# Function to perform Dijkstra's algorithm with a bucket queue; same result as dijkstra()
+def bucket_dijkstra(graph, source, max_cost):
+    distances = {node: float('inf') for node in graph}
+    previous_nodes = {node: None for node in graph}
+    distances[source] = 0
+    size = max_cost + 1
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(source)
+    heappush, heappop = heap_functions()
+    queued = 1
+    current_distance = 0
+    stale = relaxations = pushes = 0
+
+    while queued:
+        bucket = buckets[current_distance % size]
+        while not bucket:
+            current_distance += 1
+            bucket = buckets[current_distance % size]
+        if len(bucket) > 1:
+            bucket.sort()
+
+        while bucket:
+            current_node = heappop(bucket)
+            queued -= 1
+            if distances[current_node] < current_distance:
+                stale += 1
+                continue
+
+            edges = graph[current_node]
+            relaxations += len(edges)
+            for neighbor, weight in edges:
+                distance = current_distance + weight
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    previous_nodes[neighbor] = current_node
+                    queued += 1
+                    if weight:
+                        buckets[distance % size].append(neighbor)
+                        pushes += 1
+                    else:
+                        heappush(bucket, neighbor)
+
+    trace_spf(stale, relaxations, pushes)
+    return distances, previous_nodes
+
+# Function to perform Dijkstra's algorithm with a bucket queue on the CSR arrays of a
+# CompactGraph; same result as dijkstra_ids()
+def bucket_dijkstra_ids(offsets, neighbors, weights, source, max_cost):
+    num_nodes = len(offsets) - 1
+    distances = [float('inf')] * num_nodes
+    previous_nodes = [-1] * num_nodes
+    distances[source] = 0
+    size = max_cost + 1
+    buckets = [[] for _ in range(size)]
+    buckets[0].append(source)
+    heappush, heappop = heap_functions()
+    queued = 1
+    current_distance = 0
+    stale = relaxations = pushes = 0
+
+    while queued:
+        bucket = buckets[current_distance % size]
+        while not bucket:
+            current_distance += 1
+            bucket = buckets[current_distance % size]
+        if len(bucket) > 1:
+            bucket.sort()
+
+        while bucket:
+            current_node = heappop(bucket)
+            queued -= 1
+            if distances[current_node] < current_distance:
+                stale += 1
+                continue
+
+            start, end = offsets[current_node], offsets[current_node + 1]
+            relaxations += end - start
+            for slot in range(start, end):
+                neighbor = neighbors[slot]
+                weight = weights[slot]
+                distance = current_distance + weight
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    previous_nodes[neighbor] = current_node
+                    queued += 1
+                    if weight:
+                        buckets[distance % size].append(neighbor)
+                        pushes += 1
+                    else:
+                        heappush(bucket, neighbor)
+
+    trace_spf(stale, relaxations, pushes)
+    return distances, previous_nodes
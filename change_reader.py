@@ -0,0 +1,45 @@
+import argparse
+
+# Reader for the change logs written with --changes (output_writer.write_spf_changes
+# and write_dv_changes). A log holds the full table of the first step followed by
+# only the rows that changed, so the table at any time is the last row written for
+# every (node, destination) up to that time.
+#
+# python change_reader.py topology_SPF_changes.tsv 5
+# python change_reader.py topology_DVA_changes.tsv 5 --step 40
+#
+# prints the full table at time 5 (and DV step 40) in the columns of the log. The
+# time and step columns of each row tell when that entry last changed.
+
+
+# Function to rebuild the table of a change log at a time (and, for DV logs, a step);
+# returns the header and {node: {destination: row fields}}
+def read_changes(file_path, time, step=None):
+    table = {}
+    with open(file_path, 'r') as file:
+        header = file.readline().rstrip("\n").split("\t")
+        with_step = header[2] == "Step"
+        dest_column = 3 if with_step else 2
+        for line in file:
+            fields = line.rstrip("\n").split("\t")
+            if int(fields[1]) > time or (with_step and step is not None and int(fields[2]) > step):
+                continue
+            table.setdefault(fields[0], {})[fields[dest_column]] = fields
+    return header, table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full routing table at a given time from a change log.")
+    parser.add_argument("changes_file")
+    parser.add_argument("time", type=int)
+    parser.add_argument("--step", type=int, help="DV step (default: the last one of the time)")
+    args = parser.parse_args()
+
+    header, table = read_changes(args.changes_file, args.time, args.step)
+    print("\t".join(header))
+    for rows in table.values():
+        for fields in rows.values():
+            print("\t".join(fields))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+from array import array
+from collections.abc import Mapping
+
+from bucket_queue import bucket_dijkstra_ids, use_buckets
+from instrumentation import heap_functions, trace_spf
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, the arrays below are plain array.array
+    numpy = None
+
+# Compact graph: node names are interned to integer IDs and the adjacency is kept
+# in CSR form (offsets / neighbors / weights arrays). Row i holds the links of
+# node i in the order they were added, so iterating it gives the same sequence as
+# the defaultdict(list) built by parse_input_file.
+#
+# IDs follow the sorted node names, so a (distance, id) heap breaks ties exactly
+# like the (distance, name) heap used by dijkstra(). Key order (first appearance)
+# is kept separately in `order`.
+#
+# The class behaves like a read-only mapping of name -> [(neighbor, cost), ...],
+# so every algorithm written against the dict-of-lists graph accepts it as is.
+class CompactGraph(Mapping):
+    def __init__(self, adjacency=None):
+        self._build(adjacency or {})
+
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        return cls(adjacency)
+
+    # Function to wrap existing CSR buffers without copying them (e.g. memoryviews of
+    # a memory-mapped file). names must be sorted; order lists the IDs in key order.
+    @classmethod
+    def from_csr(cls, names, order, offsets, neighbors, weights):
+        graph = cls.__new__(cls)
+        graph.names = names
+        graph.ids = {name: i for i, name in enumerate(names)}
+        graph.order = order
+        graph.offsets = offsets
+        graph.neighbors = neighbors
+        graph.weights = weights
+        graph._edge_index = None
+        graph._pending = {}
+        graph._removed = set()
+        return graph
+
+    # Function to (re)build the CSR arrays from a name -> [(neighbor, cost)] mapping
+    def _build(self, adjacency):
+        first_seen = dict.fromkeys(adjacency)
+        for edges in adjacency.values():
+            for neighbor, weight in edges:
+                first_seen.setdefault(neighbor, None)
+
+        self.names = sorted(first_seen)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.order = array('i', (self.ids[name] for name in first_seen))
+
+        self.offsets = array('q', [0])
+        self.neighbors = array('i')
+        self.weights = array('i')
+        for name in self.names:
+            for neighbor, weight in adjacency.get(name, ()):
+                self.neighbors.append(self.ids[neighbor])
+                self.weights.append(weight)
+            self.offsets.append(len(self.neighbors))
+
+        self._edge_index = None
+        self._pending = {}
+        self._removed = set()
+
+    # Function to build the (u, v) -> slot index on first update; reads never need it
+    def _index(self):
+        if self._edge_index is None:
+            num_nodes = len(self.names)
+            self._edge_index = index = {}
+            offsets, neighbors = self.offsets, self.neighbors
+            for u in range(num_nodes):
+                for slot in range(offsets[u], offsets[u + 1]):
+                    index.setdefault(u * num_nodes + neighbors[slot], slot)
+        return self._edge_index
+
+    # Function to merge removed links and links that did not exist yet into the CSR arrays
+    def _flush(self):
+        if self._pending or self._removed:
+            pending, self._pending = self._pending, {}
+            removed, self._removed = self._removed, set()
+            adjacency = {self.names[i]: self._row(i) for i in self.order}
+            for u, v in removed:
+                if u in adjacency:
+                    adjacency[u] = [edge for edge in adjacency[u] if edge[0] != v]
+            for (u, v), cost in pending.items():
+                adjacency.setdefault(u, []).append((v, cost))
+            self._build(adjacency)
+
+    def _row(self, node_id):
+        names, neighbors, weights = self.names, self.neighbors, self.weights
+        return [(names[neighbors[slot]], weights[slot])
+                for slot in range(self.offsets[node_id], self.offsets[node_id + 1])]
+
+    # Function to set the cost of link (u, v) in both directions. Existing links are
+    # updated in place in O(1); new and removed (cost None) links are buffered and
+    # merged on the next read.
+    def set_cost(self, u, v, cost):
+        for a, b in ((u, v), (v, u)):
+            if cost is None:
+                self._pending.pop((a, b), None)
+                self._removed.add((a, b))
+                continue
+            if (a, b) in self._pending or (a, b) in self._removed or a not in self.ids or b not in self.ids:
+                self._pending[(a, b)] = cost
+                continue
+            slot = self._index().get(self.ids[a] * len(self.names) + self.ids[b])
+            if slot is None:
+                self._pending[(a, b)] = cost
+            else:
+                self.weights[slot] = cost
+
+    # Function to return the CSR arrays (as zero-copy NumPy views when available)
+    def csr(self, as_numpy=False):
+        self._flush()
+        if as_numpy:
+            if numpy is None:
+                raise RuntimeError("NumPy is not installed")
+            return (numpy.frombuffer(self.offsets, dtype=numpy.int64),
+                    numpy.frombuffer(self.neighbors, dtype=numpy.int32),
+                    numpy.frombuffer(self.weights, dtype=numpy.int32))
+        return self.offsets, self.neighbors, self.weights
+
+    # Function to report the bytes held by the graph arrays
+    def nbytes(self):
+        self._flush()
+        return sum(a.itemsize * len(a) for a in (self.offsets, self.neighbors, self.weights, self.order))
+
+    # Only the weights are ever written in place, so copies share everything else
+    def __deepcopy__(self, memo):
+        self._flush()
+        graph = CompactGraph.__new__(CompactGraph)
+        graph.__dict__.update(self.__dict__)
+        graph.weights = array('i')
+        graph.weights.frombytes(memoryview(self.weights).cast('B'))
+        graph._pending = {}
+        graph._removed = set()
+        return graph
+
+    def __getitem__(self, name):
+        self._flush()
+        return self._row(self.ids[name])
+
+    def __iter__(self):
+        self._flush()
+        names = self.names
+        return (names[i] for i in self.order)
+
+    def __len__(self):
+        self._flush()
+        return len(self.order)
+
+    def __contains__(self, name):
+        self._flush()
+        return name in self.ids
+
+
+# Function to perform Dijkstra's algorithm on node IDs; returns distance and
+# predecessor lists indexed by ID (-1 for no predecessor). Small integer costs go to
+# the bucket queue kernel (bucket_queue.py); max_cost, when given, is the largest cost
+# in the graph.
+def dijkstra_ids(graph, source, max_cost=None):
+    offsets, neighbors, weights = graph.csr()
+    num_nodes = len(offsets) - 1
+    if max_cost is None:
+        max_cost = max(weights, default=0) if min(weights, default=0) >= 0 else float('inf')
+    if use_buckets(max_cost, num_nodes):
+        return bucket_dijkstra_ids(offsets, neighbors, weights, source, max_cost)
+    distances = [float('inf')] * num_nodes
+    previous_nodes = [-1] * num_nodes
+    distances[source] = 0
+    pq = [(0, source)]
+    heappush, heappop = heap_functions()
+    stale = relaxations = 0
+
+    while pq:
+        current_distance, current_node = heappop(pq)
+
+        if current_distance > distances[current_node]:
+            stale += 1
+            continue
+
+        start, end = offsets[current_node], offsets[current_node + 1]
+        relaxations += end - start
+        for slot in range(start, end):
+            neighbor = neighbors[slot]
+            distance = current_distance + weights[slot]
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous_nodes[neighbor] = current_node
+                heappush(pq, (distance, neighbor))
+
+    trace_spf(stale, relaxations)
+    return distances, previous_nodes
+
+# Function to perform Dijkstra's algorithm on a CompactGraph with the same
+# name-keyed (distances, previous_nodes) result as dijkstra()
+def compact_dijkstra(graph, source, max_cost=None):
+    distances, previous_nodes = dijkstra_ids(graph, graph.ids[source], max_cost)
+    names = graph.names
+    return ({names[i]: distances[i] for i in graph.order},
+            {names[i]: names[previous_nodes[i]] if previous_nodes[i] >= 0 else None for i in graph.order})
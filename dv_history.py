@@ -0,0 +1,135 @@
+from collections.abc import Mapping, Sequence
+
+# Distance vector history stored as an initial snapshot plus sparse per-step deltas.
+#
+# The initial snapshot is the state every run starts from: each node knows only
+# itself (cost 0) and every other destination is unreachable. Each recorded step
+# keeps the (dest, old, new, nexthop) changes made by every node in that round, and
+# a reset flag for the variants that restart their tables at every timestep.
+#
+# It behaves like the old list of (time, step, vectors) tuples. Iterating replays
+# the deltas and yields a lazy view per step; a node's vector is only rebuilt when
+# the view is indexed with that node, and it stays valid until the next step is
+# read. history[i] returns a standalone copy of step i.
+#
+# convergence lists one entry per timestep, filled by the round-based backends.
+class DeltaHistory(Sequence):
+    def __init__(self, nodes):
+        self.nodes = list(nodes)
+        self.members = set(self.nodes)
+        self.steps = []
+        self.convergence = []
+
+    # Function to record one round; deltas is a list of (node, dest, old, new, nexthop).
+    # Returns the number of (node, dest) entries the round changed, each counted once
+    # however many times it was lowered, so every backend counts the same updates.
+    def record(self, time, step, deltas, reset=False):
+        by_node = {}
+        for node, dest, old, new, nexthop in deltas:
+            by_node.setdefault(node, []).append((dest, old, new, nexthop))
+        self.steps.append((time, step, reset, by_node))
+        return sum(len({change[0] for change in changes}) for changes in by_node.values())
+
+    # Function to record how one timestep converged: rounds run, entries changed (the
+    # sum of what record() returned, invalidated routes included), and whether it ended
+    # stable or out of budget
+    def record_convergence(self, time, rounds, updates, invalidated, converged):
+        self.convergence.append({"time": time, "rounds": rounds, "updates": updates, "invalidated": invalidated,
+                                 "converged": converged})
+
+    # Function to append the steps and convergence entry of one timestep recorded by an
+    # earlier run (result_cache.py)
+    def append_timestep(self, steps, convergence):
+        self.steps.extend(steps)
+        self.convergence.append(convergence)
+
+    # Function to rebuild the (local_vectors, next_hops) the run had at its last step,
+    # to continue it from there. reset_tables: the tables were restarted at a timestep
+    # that then got no rounds.
+    def replay(self, reset_tables=False):
+        vectors = {node: self.initial_vector(node) for node in self.nodes}
+        next_hops = {node: dict.fromkeys(self.nodes) for node in self.nodes}
+        for time, step, reset, by_node in self.steps:
+            if reset:
+                vectors = {node: self.initial_vector(node) for node in self.nodes}
+            for node, changes in by_node.items():
+                for dest, old, new, nexthop in changes:
+                    vectors[node][dest] = new
+                    next_hops[node][dest] = nexthop
+        if reset_tables and self.convergence and self.convergence[-1]["rounds"] == 0:
+            vectors = {node: self.initial_vector(node) for node in self.nodes}
+        return vectors, next_hops
+
+    # Function to return the deltas of step i in (node, dest, old, new, nexthop) form
+    def deltas(self, i):
+        return [(node, *change) for node, changes in self.steps[i][3].items() for change in changes]
+
+    # Function to tell whether node's vector at step i can differ from step i - 1
+    def changed(self, i, node):
+        time, step, reset, by_node = self.steps[i]
+        return reset or node in by_node
+
+    def initial_vector(self, node):
+        vector = {dest: float('inf') for dest in self.nodes}
+        vector[node] = 0
+        return vector
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __iter__(self):
+        cursor = HistoryCursor(self)
+        for i, (time, step, reset, by_node) in enumerate(self.steps):
+            yield time, step, StepVectors(cursor, i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("history index out of range")
+        cursor = HistoryCursor(self)
+        time, step = self.steps[i][:2]
+        return time, step, {node: dict(cursor.vector(node, i)) for node in self.nodes}
+
+
+# Replays the deltas of one node at a time, only as far as they are asked for
+class HistoryCursor:
+    def __init__(self, history):
+        self.history = history
+        self.vectors = {}
+        self.positions = {}
+
+    def vector(self, node, i):
+        if node not in self.vectors or self.positions[node] > i:
+            self.vectors[node] = self.history.initial_vector(node)
+            self.positions[node] = -1
+        vector = self.vectors[node]
+        steps = self.history.steps
+        for position in range(self.positions[node] + 1, i + 1):
+            time, step, reset, by_node = steps[position]
+            if reset:
+                vector.update(self.history.initial_vector(node))
+            for dest, old, new, nexthop in by_node.get(node, ()):
+                vector[dest] = new
+        self.positions[node] = i
+        return vector
+
+
+# The {node: {dest: cost}} vectors at one step of the history
+class StepVectors(Mapping):
+    def __init__(self, cursor, index):
+        self.cursor = cursor
+        self.index = index
+
+    def __getitem__(self, node):
+        if node not in self.cursor.history.members:
+            raise KeyError(node)
+        return self.cursor.vector(node, self.index)
+
+    def __iter__(self):
+        return iter(self.cursor.history.nodes)
+
+    def __len__(self):
+        return len(self.cursor.history.nodes)
@@ -0,0 +1,178 @@
+from collections.abc import Mapping
+
+from dv_history import DeltaHistory
+from failure_events import invalidated_routes, worsened_links
+from instrumentation import trace_round
+from topology_store import VersionedTopology
+
+try:
+    import numpy
+except ImportError:  # the NumPy backend is optional
+    numpy = None
+
+# Read-only view of one row of the N x N vector matrix, with the same values the
+# dict backend stores (int costs, float('inf') for unreachable)
+class VectorRow(Mapping):
+    def __init__(self, nodes, index, row):
+        self.nodes = nodes
+        self.index = index
+        self.row = row
+
+    def __getitem__(self, dest):
+        cost = self.row[self.index[dest]]
+        return int(cost) if cost != numpy.inf else float('inf')
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+# Read-only view of a whole N x N snapshot as {node: {dest: cost}}
+class VectorSnapshot(Mapping):
+    def __init__(self, nodes, index, matrix):
+        self.nodes = nodes
+        self.index = index
+        self.matrix = matrix
+
+    def __getitem__(self, node):
+        return VectorRow(self.nodes, self.index, self.matrix[self.index[node]])
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+# Distance Vector Algorithm on an N x N float matrix.
+#
+# Each round visits the nodes in the same order as the dict backend and relaxes a
+# node against all of its neighbours in one batched min-plus step
+# (cost[:, None] + vectors[neighbors]). argmin picks the first neighbour reaching
+# the minimum, which is the neighbour the sequential strict '<' loop keeps, so
+# history and next_hops are identical to the pure Python implementation.
+#
+# reset_tables selects the NoVectors behaviour: tables restart from scratch at
+# every timestep and stability is judged on the state at the start of each round.
+#
+# max_steps, timestep_steps, stop_when_quiet, history.convergence, resume and the
+# skipping of nodes none of whose neighbours changed since their last scan work as
+# in the dict backend.
+def distance_vector_numpy(graph, time_changes, max_steps=None, stability_threshold=3, reset_tables=False,
+                          timestep_steps=100, stop_when_quiet=False, resume=None):
+    if numpy is None:
+        raise RuntimeError("The numpy distance vector backend requires NumPy")
+
+    nodes = list(graph.keys())
+    index = {node: i for i, node in enumerate(nodes)}
+    num_nodes = len(nodes)
+    columns = numpy.arange(num_nodes)
+    history = DeltaHistory(nodes) if resume is None else resume
+    next_hops = numpy.full((num_nodes, num_nodes), -1, dtype=numpy.int64)
+    local_vectors = None
+    if resume is not None:
+        vectors, hops = history.replay(reset_tables)
+        local_vectors = numpy.array([[vectors[node][dest] for dest in nodes] for node in nodes], dtype=numpy.float64)
+        next_hops = numpy.array([[index[hop] if hop is not None else -1 for hop in hops[node].values()]
+                                 for node in nodes], dtype=numpy.int64)
+
+    total_steps = history.steps[-1][1] if history.steps else 0
+    threshold = 1 if stop_when_quiet else stability_threshold
+    tick = 0
+    changed_at = numpy.zeros(num_nodes, dtype=numpy.int64)
+
+    topology = VersionedTopology(graph, time_changes)
+    times = sorted([0] + list(time_changes.keys()))
+    done = len(history.convergence)
+    previous_graph = topology.version(times[done - 1]) if done else None
+    for current_time in times[done:]:
+        dv_graph = topology.version(current_time)
+        links = []
+        for node in nodes:
+            edges = dv_graph[node]
+            links.append((numpy.array([index[neighbor] for neighbor, cost in edges], dtype=numpy.int64),
+                          numpy.array([cost for neighbor, cost in edges], dtype=numpy.float64)[:, None]))
+
+        if local_vectors is None or reset_tables:
+            local_vectors = numpy.full((num_nodes, num_nodes), numpy.inf)
+            numpy.fill_diagonal(local_vectors, 0)
+
+        # Same invalidation of routes over worsened or failed links as the dict backend,
+        # skipped too when no round is left to record it
+        invalidated = []
+        has_rounds = ((max_steps is None or total_steps < max_steps)
+                      and (timestep_steps is None or timestep_steps > 0))
+        if has_rounds and previous_graph is not None and not reset_tables and current_time in time_changes:
+            worsened = worsened_links(previous_graph, dv_graph, time_changes[current_time])
+            hops = next_hops.tolist()
+
+            def next_hop(node, dest):
+                hop = hops[index[node]][index[dest]]
+                return nodes[hop] if hop >= 0 else None
+
+            for node, dest in list(invalidated_routes(nodes, next_hop, worsened)):
+                i, j = index[node], index[dest]
+                old = local_vectors[i, j]
+                invalidated.append((node, dest, int(old) if old != numpy.inf else float('inf'), float('inf'), None))
+                local_vectors[i, j] = numpy.inf
+                next_hops[i, j] = -1
+        previous_graph = dv_graph
+        num_invalidated = len(invalidated)
+        scanned_at = [-1] * num_nodes
+
+        stable_iterations = rounds = updates = 0
+        converged = False
+        changed_last_round = None
+        reset = reset_tables
+
+        while ((max_steps is None or total_steps < max_steps)
+               and (timestep_steps is None or rounds < timestep_steps)):
+            updated = False
+            total_steps += 1
+            rounds += 1
+            deltas, invalidated = invalidated, []
+
+            for i, (neighbors, costs) in enumerate(links):
+                last_scan = scanned_at[i]
+                tick += 1
+                scanned_at[i] = tick
+                if not len(neighbors) or changed_at[neighbors].max() <= last_scan:
+                    continue
+                candidates = costs + local_vectors[neighbors]
+                best = candidates.argmin(axis=0)
+                best_costs = candidates[best, columns]
+                improved = best_costs < local_vectors[i]
+                if improved.any():
+                    dests = improved.nonzero()[0]
+                    hops = neighbors[best[dests]]
+                    node = nodes[i]
+                    for dest, old, new, hop in zip(dests.tolist(), local_vectors[i, dests].tolist(),
+                                                   best_costs[dests].tolist(), hops.tolist()):
+                        deltas.append((node, nodes[dest], int(old) if old != numpy.inf else float('inf'),
+                                       int(new), nodes[hop]))
+                    local_vectors[i, dests] = best_costs[dests]
+                    next_hops[i, dests] = hops
+                    changed_at[i] = tick
+                    updated = True
+
+            # Check for stability
+            if reset_tables:
+                quiet = changed_last_round is False
+                changed_last_round = updated
+            else:
+                quiet = not deltas
+            stable_iterations = stable_iterations + 1 if quiet else 0
+
+            changed = history.record(current_time, total_steps, deltas, reset)
+            trace_round(current_time, total_steps, changed)
+            reset = False
+            updates += changed
+
+            if not updated and stable_iterations >= threshold:
+                converged = True
+                break
+        history.record_convergence(current_time, rounds, updates, num_invalidated, converged)
+
+    next_hops = {node: {dest: nodes[hop] if hop >= 0 else None for dest, hop in zip(nodes, next_hops[index[node]])}
+                 for node in nodes}
+    return history, next_hops, VectorSnapshot(nodes, index, local_vectors)
@@ -0,0 +1,102 @@
+from collections import Counter, defaultdict
+
+from failure_events import ANY_NEIGHBOR, link_cost
+from topology_store import VersionedTopology
+
+# Event coalescing: reduce the changes of a timestep (or of a window of timesteps) to
+# one net change per link before anything is recomputed.
+#
+# The changes are followed in order, node failures included, and only the last cost
+# of each link is kept. A link that ends up as it was before the timestep (a flap
+# that came back, a cost set to its current value) is dropped, and a timestep left
+# without changes is dropped too, so neither SPF nor DV recomputes it. With a window,
+# the timestamps less than window apart from the first one of the group are merged
+# into one timestep at the group's last time; the states in between are not computed.
+#
+# Links whose net change is not just their last cost keep every change: links to a
+# node that does not exist yet (the change creates it), links with parallel entries
+# and self-loops.
+#
+# Output differs from the uncoalesced run only in the timesteps it drops. A link that
+# was removed and added back keeps its old place in the adjacency lists, which can
+# pick another DV next hop among equal-cost ones.
+#
+# time_changes, counts = coalesce_changes(graph, time_changes, window=1)
+# python routing_engine.py topology.txt --coalesce-window 5
+
+
+# Function to reduce one list of (u, v, cost) changes to their net effect on graph,
+# which is left untouched. counts gets the changes read, kept, merged and no-ops.
+def net_changes(graph, changes, counts=None):
+    counts = Counter() if counts is None else counts
+    link_changes = {}
+    raw = set()
+    touched = defaultdict(dict)
+
+    # Function to follow one link change, expanding node failures on the state so far
+    def follow(u, v, cost):
+        key = (u, v) if u < v else (v, u)
+        if key not in link_changes:
+            link_changes[key] = []
+            if (u not in graph or v not in graph or u == v
+                    or sum(1 for neighbor, weight in graph[u] if neighbor == v) > 1):
+                raw.add(key)
+        link_changes[key].append((u, v, cost))
+        touched[u][v] = touched[v][u] = cost
+
+    for u, v, cost in changes:
+        counts["changes"] += 1
+        if cost is None and v == ANY_NEIGHBOR:
+            neighbors = [neighbor for neighbor, weight in graph.get(u, ()) if neighbor not in touched[u]]
+            neighbors += [neighbor for neighbor, new_cost in touched[u].items() if new_cost is not None]
+            for neighbor in dict.fromkeys(neighbors):
+                follow(u, neighbor, None)
+        else:
+            follow(u, v, cost)
+
+    net = []
+    for key, link in link_changes.items():
+        if key in raw:
+            net.extend(link)
+            continue
+        counts["merged"] += len(link) - 1
+        if link[-1][2] == link_cost(graph, *key):
+            counts["noops"] += 1
+        else:
+            net.append(link[-1])
+    counts["kept"] += len(net)
+    return net
+
+
+# Function to coalesce every timestep of time_changes (see above), grouping the
+# timestamps less than window apart. Returns the new time_changes and the counts.
+def coalesce_changes(graph, time_changes, window=1):
+    topology = VersionedTopology(graph, time_changes)
+    coalesced = defaultdict(list)
+    counts = Counter()
+    groups = []
+    for time in sorted(time_changes):
+        if time <= 0:
+            coalesced[time] = list(time_changes[time])
+        elif groups and time - groups[-1][0] < window:
+            groups[-1].append(time)
+        else:
+            groups.append([time])
+
+    previous_time = 0
+    for group in groups:
+        counts["timesteps"] += len(group)
+        changes = net_changes(topology.version(previous_time),
+                              [change for time in group for change in time_changes[time]], counts)
+        if changes:
+            coalesced[group[-1]] = changes
+            counts["kept_timesteps"] += 1
+        previous_time = group[-1]
+    return coalesced, counts
+
+# Function to summarise the counts of coalesce_changes() in one line
+def coalescing_report(counts):
+    return (f"coalesce: {counts['changes']} changes in {counts['timesteps']} timesteps reduced to "
+            f"{counts['kept']} in {counts['kept_timesteps']} ({counts['noops']} no-op links, "
+            f"{counts['merged']} superseded changes); "
+            f"{counts['timesteps'] - counts['kept_timesteps']} SPF and DV recomputations avoided")
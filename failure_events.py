@@ -0,0 +1,67 @@
+# Failure events. In the input a link failure is "time: u, v, down" and a node
+# failure is "time: u, *, down". They are kept in time_changes as (u, v, None) and
+# (u, "*", None) next to the usual (u, v, cost) changes. A failed node stays in the
+# graph without links, and a later "time: u, v, cost" brings a link back.
+DOWN = "down"
+ANY_NEIGHBOR = "*"
+
+
+# Function to read the cost field of an input line; None means the link failed
+def parse_cost(token, time):
+    token = token.strip()
+    if token != DOWN:
+        return int(token)
+    if time == 0:
+        raise ValueError("the time 0 topology cannot contain failures")
+    return None
+
+# Function to replace node failures by the failures of every link the node has in
+# graph at that point of the change list
+def expand_failures(graph, changes):
+    for u, v, cost in changes:
+        if cost is None and v == ANY_NEIGHBOR:
+            for neighbor in dict.fromkeys(neighbor for neighbor, weight in graph.get(u, ())):
+                yield u, neighbor, None
+        else:
+            yield u, v, cost
+
+# Function to get the effective cost of a link (cheapest parallel entry), or None
+def link_cost(graph, u, v):
+    costs = [weight for neighbor, weight in graph.get(u, ()) if neighbor == v]
+    return min(costs) if costs else None
+
+# Function to list the directed links that got more expensive or went down between
+# two versions of the graph
+def worsened_links(before, after, changes):
+    worsened = set()
+    for u, v, cost in expand_failures(before, changes):
+        old_cost, new_cost = link_cost(before, u, v), link_cost(after, u, v)
+        if old_cost is not None and (new_cost is None or new_cost > old_cost):
+            worsened.update(((u, v), (v, u)))
+    return worsened
+
+# Function to find the distance vector routes broken by worsened links: the route of
+# node to dest is broken when its next hop chain crosses one of them. next_hop(node,
+# dest) reads the current next hop. Only the destinations actually routed over a
+# worsened link are followed, so the work grows with the routes that are affected.
+def invalidated_routes(nodes, next_hop, worsened):
+    broken_by_dest = {}
+    for u, v in worsened:
+        for dest in nodes:
+            if next_hop(u, dest) == v:
+                broken_by_dest.setdefault(dest, set()).add(u)
+
+    for dest, broken in broken_by_dest.items():
+        upstream = {}
+        for node in nodes:
+            hop = next_hop(node, dest)
+            if hop is not None:
+                upstream.setdefault(hop, []).append(node)
+        stack = list(broken)
+        while stack:
+            for node in upstream.get(stack.pop(), ()):
+                if node not in broken:
+                    broken.add(node)
+                    stack.append(node)
+        for node in broken:
+            yield node, dest
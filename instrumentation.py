@@ -0,0 +1,193 @@
+import argparse
+import cProfile
+import heapq
+import json
+import os
+import pstats
+import sys
+import time
+from collections import Counter
+
+# Optional instrumentation for the SPF and DV engines.
+#
+# Nothing is recorded unless a Tracer is enabled. The engines only ask for their
+# heap functions once per call (heap_functions()) and open a phase() per timestep,
+# per DV round and per writer; with tracing off those return the plain heapq
+# functions and a shared no-op context, so the hot loops run unchanged.
+#
+# With tracing on the tracer counts heap pushes and pops, stale heap entries that
+# were skipped, DV updates, and records every phase with its wall time and
+# arguments. The trace is written as JSON lines (one object per phase, then the
+# counters) or in the Chrome trace format (chrome://tracing, Perfetto).
+#
+# python instrumentation.py topology.txt --trace run.json --format chrome --cprofile run.prof
+# runs routing_engine.main() with tracing and/or under cProfile.
+
+# The active Tracer, or None
+tracer = None
+
+
+class Tracer:
+    def __init__(self, path=None, trace_format="jsonl"):
+        if trace_format not in ("jsonl", "chrome"):
+            raise ValueError(f"Unknown trace format {trace_format}")
+        self.path = path
+        self.trace_format = trace_format
+        self.counters = Counter()
+        self.phases = []
+        self.start = time.perf_counter()
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    # Function to record an instant event (no duration)
+    def event(self, name, **args):
+        self.phases.append((name, time.perf_counter() - self.start, None, args))
+
+    def push(self, heap, item):
+        self.counters["heap_pushes"] += 1
+        heapq.heappush(heap, item)
+
+    def pop(self, heap):
+        self.counters["heap_pops"] += 1
+        return heapq.heappop(heap)
+
+    # Function to write the trace to path (or the path given to the tracer)
+    def write(self, path=None):
+        path = path or self.path
+        if path is None:
+            return
+        with open(path, "w") as file:
+            if self.trace_format == "chrome":
+                pid = os.getpid()
+                events = []
+                for name, start, seconds, args in self.phases:
+                    event = {"name": name, "cat": name.split("_")[0], "ts": round(start * 1e6, 3), "pid": pid,
+                             "tid": 0, "args": args}
+                    if seconds is None:
+                        event.update(ph="i", s="t")
+                    else:
+                        event.update(ph="X", dur=round(seconds * 1e6, 3))
+                    events.append(event)
+                end = time.perf_counter() - self.start
+                events.append({"name": "counters", "ph": "C", "ts": round(end * 1e6, 3), "pid": pid, "tid": 0,
+                               "args": dict(self.counters)})
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+            else:
+                for name, start, seconds, args in sorted(self.phases, key=lambda phase: phase[1]):
+                    record = {"type": "event" if seconds is None else "phase", "name": name, "start": round(start, 6)}
+                    if seconds is not None:
+                        record["seconds"] = round(seconds, 6)
+                    file.write(json.dumps({**record, **args}) + "\n")
+                file.write(json.dumps({"type": "counters", **self.counters}) + "\n")
+
+
+# One timed phase; the dict returned by `with` can take more arguments for the record
+class Phase:
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.args
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        self.tracer.phases.append((self.name, self.start - self.tracer.start, end - self.start, self.args))
+        return False
+
+
+class NoPhase:
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NO_PHASE = NoPhase()
+
+
+# Function to start recording; returns the new tracer
+def enable(path=None, trace_format="jsonl"):
+    global tracer
+    tracer = Tracer(path, trace_format)
+    return tracer
+
+# Function to stop recording and write the trace; returns the finished tracer
+def disable():
+    global tracer
+    finished, tracer = tracer, None
+    if finished is not None:
+        finished.write()
+    return finished
+
+# Function to get (heappush, heappop) for one SPF run, counting when tracing is on
+def heap_functions():
+    if tracer is None:
+        return heapq.heappush, heapq.heappop
+    return tracer.push, tracer.pop
+
+def phase(name, **args):
+    if tracer is None:
+        return NO_PHASE
+    return Phase(tracer, name, args)
+
+# Function to add the stale entries and relaxed links of one SPF run to the counters,
+# and the queue entries it pushed without heap_functions() (bucket_queue.py)
+def trace_spf(stale, relaxations, pushes=0):
+    if tracer is not None:
+        counters = tracer.counters
+        counters["heap_pushes"] += pushes
+        counters["spf_runs"] += 1
+        counters["stale_skips"] += stale
+        counters["relaxations"] += relaxations
+
+# Function to record one distance vector round and the updates it made
+def trace_round(time, step, updates):
+    if tracer is not None:
+        tracer.counters["dv_rounds"] += 1
+        tracer.counters["dv_updates"] += updates
+        tracer.event("dv_round", time=time, step=step, updates=updates)
+
+# Function to add the stale entries and relaxed links of one SPF tree repair
+# (repair_spf_tree(), --incremental) to the counters
+def trace_repair(stale, relaxations):
+    if tracer is not None:
+        counters = tracer.counters
+        counters["spf_repairs"] += 1
+        counters["stale_skips"] += stale
+        counters["relaxations"] += relaxations
+
+def main():
+    parser = argparse.ArgumentParser(description="Run routing_engine.main() with instrumentation and/or cProfile.")
+    parser.add_argument("input_file")
+    parser.add_argument("--trace", help="write the phase trace and counters here")
+    parser.add_argument("--format", default="jsonl", choices=["jsonl", "chrome"])
+    parser.add_argument("--cprofile", help="also run under cProfile and save the stats here")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args()
+
+    # Run as a script this file is __main__; the engines use the imported module
+    import instrumentation
+    import routing_engine
+    if args.trace:
+        instrumentation.enable(args.trace, args.format)
+    try:
+        if args.cprofile:
+            profiler = cProfile.Profile()
+            profiler.runcall(routing_engine.main, args.input_file, incremental=args.incremental, compact=args.compact)
+            profiler.dump_stats(args.cprofile)
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(15)
+        else:
+            routing_engine.main(args.input_file, incremental=args.incremental, compact=args.compact)
+    finally:
+        finished = instrumentation.disable()
+    if finished is not None:
+        print(f"Trace written to {args.trace}: {dict(finished.counters)}")
+
+if __name__ == "__main__":
+    main()
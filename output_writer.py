@@ -0,0 +1,166 @@
+from dv_history import DeltaHistory
+from instrumentation import phase
+
+# Output stage shared by the four scripts.
+#
+# Rows are built per step and written as one block through a large buffer instead
+# of one file.write per row. SPF paths are memoized: a node's path is its
+# predecessor's path plus one hop, so each path string is built once per tree, and
+# a tree that is the same object as the previous timestep's (incremental SPF keeps
+# unchanged trees) reuses the strings of the previous step. DV rows of a node are
+# only rebuilt at the steps where the history recorded a change for that node.
+#
+# Besides one file per node, every writer has a single-file table form: one TSV
+# with the source node as its first column, grouped by source, and a change log
+# form: the same table, but after the first step a row is only written when it
+# differs from the last one written for that (node, destination). change_reader.py
+# rebuilds the full table at any time from it.
+WRITE_BUFFER = 1 << 20
+
+
+# Function to put the same leading columns in front of every row of a block
+def join_rows(row_prefix, rows):
+    return row_prefix + ("\n" + row_prefix).join(rows) + "\n" if rows else ""
+
+
+# Function to build the "A -> B -> C" path of every destination from one SPF tree.
+# Destinations are visited by distance, so a node's predecessor normally has its
+# path already and the node only adds one hop to it.
+def path_strings(distances, previous_nodes):
+    paths = {}
+    for dest in sorted(distances, key=distances.__getitem__):
+        parent = previous_nodes[dest]
+        if not parent:
+            paths[dest] = dest
+        elif parent in paths:
+            paths[dest] = f"{paths[parent]} -> {dest}"
+        else:
+            # Zero cost links can put a predecessor after its node
+            chain = []
+            current = dest
+            while current and current not in paths:
+                chain.append(current)
+                current = previous_nodes[current]
+            path = paths[current] if current else None
+            for node in reversed(chain):
+                path = node if path is None else f"{path} -> {node}"
+                paths[node] = path
+    return paths
+
+# Function to write the SPF rows of one source, prefix goes in front of every row
+def write_spf_rows(file, results, prefix=""):
+    tree = costs = rows = None
+    for step, (distances, previous_nodes) in results.items():
+        if previous_nodes is not tree or distances is not costs:
+            tree, costs = previous_nodes, distances
+            paths = path_strings(distances, previous_nodes)
+            rows = [f"\t{dest}\t{cost}\t{paths[dest]}" for dest, cost in distances.items()]
+        file.write(join_rows(f"{prefix}{step}", rows))
+
+# Function to write one SPF file per source node
+def write_spf_files(base_name, spf_results):
+    with phase("write_spf", layout="files"):
+        for node, results in spf_results.items():
+            with open(f"{base_name}_SPF_{node}.txt", "w", buffering=WRITE_BUFFER) as file:
+                file.write("Steps\tDestination\tCost\tPath\n")
+                write_spf_rows(file, results)
+
+# Function to write the SPF results of every source to one table
+def write_spf_table(base_name, spf_results):
+    with phase("write_spf", layout="table"), open(f"{base_name}_SPF.tsv", "w", buffering=WRITE_BUFFER) as file:
+        file.write("Source\tSteps\tDestination\tCost\tPath\n")
+        for node, results in spf_results.items():
+            write_spf_rows(file, results, f"{node}\t")
+
+
+# Function to write the SPF change log: the full table of the first timestep, then the
+# rows that changed. Trees shared with the previous timestep are skipped outright.
+def write_spf_changes(base_name, spf_results):
+    with phase("write_spf", layout="changes"), \
+            open(f"{base_name}_SPF_changes.tsv", "w", buffering=WRITE_BUFFER) as file:
+        file.write("Source\tSteps\tDestination\tCost\tPath\n")
+        for node, results in spf_results.items():
+            tree = costs = None
+            written = {}
+            for step, (distances, previous_nodes) in results.items():
+                if previous_nodes is tree and distances is costs:
+                    continue
+                tree, costs = previous_nodes, distances
+                paths = path_strings(distances, previous_nodes)
+                rows = []
+                for dest, cost in distances.items():
+                    row = f"\t{dest}\t{cost}\t{paths[dest]}"
+                    if written.get(dest) != row:
+                        written[dest] = row
+                        rows.append(row)
+                file.write(join_rows(f"{node}\t{step}", rows))
+
+
+def format_cost(cost):
+    return str(int(cost)) if cost != float('inf') else "N"
+
+# Function to build the rows (after the time column) of a table with the local vector
+def vector_rows(vector, hops):
+    local_vector = " | " + " ".join([format_cost(vector[dest]) for dest in vector])
+    return [f"\t{dest}\t{hops.get(dest) or 'N'}\t{format_cost(cost)}\t{local_vector}"
+            for dest, cost in vector.items()]
+
+# Function to build the rows (after the time and step columns) of a plain table
+def step_rows(vector, hops):
+    return [f"\t{dest}\t{hops.get(dest) or '-'}\t{cost}" for dest, cost in vector.items()]
+
+# Function to write the DV rows of one node. make_rows builds the rows from the
+# node's vector; with_step adds the step number after the time.
+def write_dv_rows(file, dv_history, node, hops, make_rows, with_step=False, prefix=""):
+    deltas = dv_history if isinstance(dv_history, DeltaHistory) else None
+    rows = block = block_prefix = None
+    for i, (time, step, vectors) in enumerate(dv_history):
+        if rows is None or deltas is None or deltas.changed(i, node):
+            rows = make_rows(vectors[node], hops)
+            block = None
+        row_prefix = f"{prefix}{time}\t{step}" if with_step else f"{prefix}{time}"
+        if block is None or row_prefix != block_prefix:
+            block, block_prefix = join_rows(row_prefix, rows), row_prefix
+        file.write(block)
+
+# Function to write one DV file per node
+def write_dv_files(base_name, dv_history, next_hops, header, make_rows, with_step=False):
+    with phase("write_dv", layout="files"):
+        for node in next_hops.keys():
+            with open(f"{base_name}_DVA_{node}.txt", "w", buffering=WRITE_BUFFER) as file:
+                file.write(header)
+                write_dv_rows(file, dv_history, node, next_hops[node], make_rows, with_step)
+
+# Function to write the DV results of every node to one table
+def write_dv_table(base_name, dv_history, next_hops, header, make_rows, with_step=False):
+    with phase("write_dv", layout="table"), open(f"{base_name}_DVA.tsv", "w", buffering=WRITE_BUFFER) as file:
+        file.write("Node\t" + header)
+        for node in next_hops.keys():
+            write_dv_rows(file, dv_history, node, next_hops[node], make_rows, with_step, f"{node}\t")
+
+# Function to write the DV change log in the step format columns: the vectors of the
+# first step, then the destinations whose cost changed. With a DeltaHistory only the
+# recorded deltas are looked at (whole vectors at the steps that reset the tables).
+def write_dv_changes(base_name, dv_history, next_hops):
+    deltas = dv_history if isinstance(dv_history, DeltaHistory) else None
+    written = {node: {} for node in next_hops}
+    with phase("write_dv", layout="changes"), \
+            open(f"{base_name}_DVA_changes.tsv", "w", buffering=WRITE_BUFFER) as file:
+        file.write("Node\tTime\tStep\tDestination\tNextHop\tCost\n")
+        for i, (time, step, vectors) in enumerate(dv_history):
+            rows = []
+            for node, hops in next_hops.items():
+                vector, last = vectors[node], written[node]
+                if i == 0 or deltas is None or deltas.steps[i][2]:
+                    dests = vector
+                elif node in deltas.steps[i][3]:
+                    dests = dict.fromkeys(change[0] for change in deltas.steps[i][3][node])
+                else:
+                    continue
+                for dest in dests:
+                    cost = vector[dest]
+                    if dest not in last or last[dest] != cost:
+                        last[dest] = cost
+                        rows.append(f"{node}\t{time}\t{step}\t{dest}\t{hops.get(dest) or '-'}\t{cost}")
+            if rows:
+                file.write("\n".join(rows) + "\n")
@@ -0,0 +1,106 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from binary_format import BinaryTopology, pack_topology
+from compact_graph import CompactGraph, dijkstra_ids
+from failure_events import expand_failures
+
+# Graph attached by this worker process: (shared memory name, SharedMemory, topology, graph)
+worker_graph = None
+
+# Function to attach to the shared graph once per version and reuse it across tasks
+def attach_shared_graph(name):
+    global worker_graph
+    if worker_graph is not None and worker_graph[0] == name:
+        return worker_graph[3]
+    if worker_graph is not None:
+        worker_graph[2].release()
+        worker_graph[1].close()
+    # Pool workers share the parent's resource tracker, so attaching here does not
+    # hand ownership of the block to this process
+    shared = SharedMemory(name=name)
+    topology = BinaryTopology(shared.buf, name)
+    worker_graph = (name, shared, topology, topology.graph())
+    return worker_graph[3]
+
+# Function run in the worker processes: SPF for a chunk of sources on the shared graph.
+# Results come back as lists in key order to keep pickling cheap.
+def spf_worker(name, sources):
+    graph = attach_shared_graph(name)
+    names, order = graph.names, graph.order
+    results = []
+    for source in sources:
+        distances, previous_nodes = dijkstra_ids(graph, graph.ids[source])
+        results.append((source, [distances[i] for i in order],
+                        [names[previous_nodes[i]] if previous_nodes[i] >= 0 else None for i in order]))
+    return results
+
+
+# The graph published to the workers. It lives in one shared memory block in the
+# binary topology layout; the parent's CompactGraph is a view into that block, so
+# cost updates on existing links reach the workers without copying anything. A
+# change that adds or removes links rebuilds the arrays privately and is published
+# again.
+class SharedGraph:
+    def __init__(self, graph):
+        self.shared = None
+        self.topology = None
+        self.publish(graph)
+
+    def publish(self, graph):
+        data = pack_topology(graph, {})
+        shared = SharedMemory(create=True, size=len(data))
+        shared.buf[:len(data)] = data
+        self.close()
+        self.shared = shared
+        self.topology = BinaryTopology(shared.buf, shared.name)
+        self.graph = self.topology.graph()
+        self.weights = self.graph.weights
+
+    # Function to apply one timestep's changes and republish if links were added or removed
+    def apply(self, changes):
+        for u, v, cost in expand_failures(self.graph, changes):
+            self.graph.set_cost(u, v, cost)
+        self.graph.csr()
+        if self.graph.weights is not self.weights:
+            self.publish(self.graph)
+
+    def close(self):
+        if self.shared is not None:
+            self.graph = None
+            self.topology.release()
+            self.shared.close()
+            self.shared.unlink()
+            self.shared = None
+
+
+# Function to run SPF for every source at every timestep on a process pool. Same
+# results as calling dijkstra() for every node in main(); the graph is shared with
+# the workers through shared memory instead of being pickled per task.
+def parallel_spf(graph, time_changes, workers=None, chunks_per_worker=4):
+    workers = workers or os.cpu_count()
+    if not isinstance(graph, CompactGraph):
+        graph = CompactGraph.from_adjacency(graph)
+    shared = SharedGraph(graph)
+    spf_results = {node: {} for node in graph}
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for time in sorted([0] + list(time_changes.keys())):
+                if time > 0 and time in time_changes:
+                    shared.apply(time_changes[time])
+
+                keys = list(shared.graph)
+                chunk_size = max(1, math.ceil(len(keys) / (workers * chunks_per_worker)))
+                futures = [executor.submit(spf_worker, shared.shared.name, keys[i:i + chunk_size])
+                           for i in range(0, len(keys), chunk_size)]
+                for future in futures:
+                    for source, distances, previous_nodes in future.result():
+                        spf_results.setdefault(source, {})[time] = (dict(zip(keys, distances)),
+                                                                    dict(zip(keys, previous_nodes)))
+    finally:
+        shared.close()
+
+    return spf_results
@@ -0,0 +1,181 @@
+import argparse
+import heapq
+
+from failure_events import link_cost
+from topology_store import VersionedTopology
+from routing_engine import dijkstra, parse_input_file
+
+# Point-to-point SPF queries: the cost and one shortest path between two nodes at a
+# given time, without computing the full tree of the source.
+#
+# The search is bidirectional Dijkstra: one search grows from the source, one from
+# the destination (links are symmetric, so both walk the same adjacency lists), and
+# it stops as soon as the two frontiers together cannot beat the best meeting path
+# found so far. Only the nodes closer than about half the answer to either end are
+# ever settled.
+#
+# With landmarks > 0 the searches are also steered towards each other by ALT
+# (A*, landmarks, triangle inequality) lower bounds. The landmarks are picked on the
+# time 0 graph, spread out by repeatedly taking the node farthest from the ones
+# already picked, and their distances to every node are computed once; each query
+# uses the ACTIVE_LANDMARKS of them that bound its src-dst distance best. The bounds
+# stay valid as long as no link got cheaper than at time 0 and no new link appeared
+# (failures and cost increases only make paths longer); from the first timestep that
+# breaks this, queries run without them.
+#
+# The cost is always the one dijkstra() gives. With several shortest paths of the
+# same cost the path returned can differ from the one in the SPF tree.
+#
+# python path_query.py topology.txt 5 A F --landmarks 8
+
+# Landmarks consulted per query
+ACTIVE_LANDMARKS = 2
+
+
+class PathQuery:
+    def __init__(self, graph, time_changes=None, landmarks=0):
+        self.topology = VersionedTopology(graph, time_changes)
+        self.landmarks = select_landmarks(graph, landmarks) if landmarks else []
+
+        # First time at which a link is cheaper than (or missing from) the time 0 graph
+        self.landmarks_until = None
+        for time in self.topology.times[1:]:
+            graph_at = self.topology.version(time)
+            for u, v, cost in time_changes[time]:
+                base_cost, new_cost = link_cost(graph, u, v), link_cost(graph_at, u, v)
+                if cost is not None and (base_cost is None or (new_cost is not None and new_cost < base_cost)):
+                    self.landmarks_until = time
+                    break
+            if self.landmarks_until is not None:
+                break
+
+    # Function to return (cost, [src, ..., dst]) at a time, or (inf, None) when dst
+    # cannot be reached
+    def shortest_path(self, time, src, dst):
+        graph = self.topology.version(time)
+        for node in (src, dst):
+            if node not in graph:
+                raise KeyError(node)
+        potential = None
+        if self.landmarks and (self.landmarks_until is None or time < self.landmarks_until):
+            potential = landmark_potential(self.landmarks, src, dst)
+        return bidirectional_dijkstra(graph, src, dst, potential)
+
+
+# Function to pick count landmarks spread over the graph; returns the distance map
+# (dijkstra() distances) of each landmark
+def select_landmarks(graph, count):
+    landmarks = []
+    nearest = dict.fromkeys(graph, float('inf'))
+    candidate = next(iter(graph), None)
+    while candidate is not None and len(landmarks) < count:
+        distances, _ = dijkstra(graph, candidate)
+        landmarks.append(distances)
+        for node, distance in distances.items():
+            if distance < nearest[node]:
+                nearest[node] = distance
+        # Nodes no landmark reaches (another component) come first, as inf
+        candidate = max(nearest, key=nearest.__getitem__)
+        if nearest[candidate] == 0:
+            candidate = None
+    return landmarks
+
+# Function to build the ALT potential of a query: half the difference between the
+# lower bounds to dst and from src, which keeps both searches consistent. Only the
+# landmarks giving the best src-dst bound are used, every extra one costs more per
+# node than its tighter bound saves.
+def landmark_potential(landmarks, src, dst, active=ACTIVE_LANDMARKS):
+    inf = float('inf')
+    bounds = [(distances, distances.get(src, inf), distances.get(dst, inf)) for distances in landmarks]
+    bounds.sort(key=lambda bound: abs(bound[1] - bound[2]) if inf not in bound[1:] else -1, reverse=True)
+    del bounds[active:]
+    cache = {}
+
+    def potential(node):
+        value = cache.get(node)
+        if value is None:
+            to_dst = from_src = 0
+            for distances, src_distance, dst_distance in bounds:
+                distance = distances.get(node, inf)
+                if distance == inf:
+                    continue
+                if dst_distance != inf:
+                    to_dst = max(to_dst, abs(distance - dst_distance))
+                if src_distance != inf:
+                    from_src = max(from_src, abs(distance - src_distance))
+            value = cache[node] = (to_dst - from_src) / 2
+        return value
+
+    return potential
+
+# Function to find the cost and a shortest path from src to dst with bidirectional
+# Dijkstra. potential(node) is an optional consistent lower bound potential (ALT);
+# the forward search orders its heap by distance + potential, the backward search
+# by distance - potential.
+def bidirectional_dijkstra(graph, src, dst, potential=None):
+    if src == dst:
+        return 0, [src]
+    potential = potential or (lambda node: 0)
+    distances = ({src: 0}, {dst: 0})
+    previous_nodes = ({src: None}, {dst: None})
+    settled = (set(), set())
+    heaps = ([(potential(src), src)], [(-potential(dst), dst)])
+    signs = (1, -1)
+    best, meeting = float('inf'), None
+
+    while heaps[0] and heaps[1]:
+        # Every path not found yet costs at least the sum of the two smallest keys
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        key, node = heapq.heappop(heaps[side])
+        if node in settled[side]:
+            continue
+        settled[side].add(node)
+
+        distance, other = distances[side], distances[1 - side]
+        sign = signs[side]
+        current_distance = distance[node]
+        for neighbor, weight in graph[node]:
+            new_distance = current_distance + weight
+            if new_distance < distance.get(neighbor, float('inf')):
+                distance[neighbor] = new_distance
+                previous_nodes[side][neighbor] = node
+                heapq.heappush(heaps[side], (new_distance + sign * potential(neighbor), neighbor))
+            if neighbor in other and new_distance + other[neighbor] < best:
+                best = new_distance + other[neighbor]
+                meeting = (node, neighbor) if side == 0 else (neighbor, node)
+
+    if meeting is None:
+        return float('inf'), None
+    path = []
+    node = meeting[0]
+    while node is not None:
+        path.append(node)
+        node = previous_nodes[0][node]
+    path.reverse()
+    node = meeting[1]
+    while node is not None:
+        path.append(node)
+        node = previous_nodes[1][node]
+    return best, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost and shortest path between two nodes at a given time.")
+    parser.add_argument("input_file")
+    parser.add_argument("time", type=int)
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--landmarks", type=int, default=0, help="ALT landmarks picked on the time 0 graph")
+    args = parser.parse_args()
+
+    graph, time_changes = parse_input_file(args.input_file)
+    cost, path = PathQuery(graph, time_changes, args.landmarks).shortest_path(args.time, args.src, args.dst)
+    if path is None:
+        print(f"{args.dst} cannot be reached from {args.src} at time {args.time}")
+    else:
+        print(f"{cost}\t{' -> '.join(path)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict, deque
+
+from event_coalescing import net_changes
+from stream_parser import LINE
+from failure_events import DOWN
+from routing_engine import apply_time_changes, dijkstra, parse_input_file, spf_trees, update_spf_trees
+
+# Routing daemon: the simulator as a long-running asyncio service.
+#
+# Clients connect over TCP or a Unix socket and send one request per line; every
+# line gets one JSON line back, in order:
+#
+#   5: A, B, 3 / 5: A, B, down / 5: A, *, down   a change event, same syntax as the
+#                        input files -> {"queued": n} (n counts the events so far);
+#                        a negative cost gets an error instead
+#   sync                 waits until every event queued so far is applied -> {"applied": n}
+#   route SRC DST        -> {"src", "dst", "cost", "path"} (cost and path null when unreachable)
+#   table NODE           -> {"node", "routes": [[destination, cost, next hop], ...]}
+#   metrics              -> query latency percentiles and event ingest throughput
+#   quit                 closes the connection
+#
+# The SPF trees of every node are kept up to date incrementally (update_spf_trees,
+# as with --incremental). Events are only queued by the connection that sends them;
+# one applier task drains the queue and applies everything that piled up as a single
+# batch, yielding to the queries between batches, so a burst of events costs one
+# repair pass and queries are never stuck behind a long backlog. A batch is first
+# reduced to one net change per link (net_changes()), so a link that flapped back
+# within it is not repaired at all. Queries read the
+# trees as of the last applied batch; "sync" gives read-your-writes.
+#
+# python routing_daemon.py serve topology.txt --tcp 127.0.0.1:7400
+# python routing_daemon.py client topology.txt --tcp 127.0.0.1:7400 --clients 8 --queries 500 --check
+
+# Latencies kept per query kind for the percentiles
+LATENCY_WINDOW = 10000
+DEFAULT_TCP = "127.0.0.1:7400"
+
+
+# Function to return the p-th percentile of a sorted list
+def percentile(values, p):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+# Function to parse one event line into (time, (u, v, cost)), or None when it is not an
+# event. Negative costs are refused: SPF never settles on a negative link.
+def parse_event(line):
+    record = LINE.fullmatch(line)
+    if record is None:
+        return None
+    event_time, u, v, cost = record.groups()
+    cost = None if cost == DOWN else int(cost)
+    if cost is not None and cost < 0:
+        raise ValueError(f"negative link cost: {line}")
+    return int(event_time), (u, v, cost)
+
+
+class RoutingDaemon:
+    def __init__(self, graph=None):
+        self.graph = defaultdict(list, ((node, list(edges)) for node, edges in (graph or {}).items()))
+        self.trees = spf_trees(self.graph)
+        self.exact = all(weight > 0 for edges in self.graph.values() for neighbor, weight in edges)
+        self.pending = []
+        self.queued = self.applied = 0
+        self.time = 0
+        self.changed = asyncio.Condition()
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.counts = defaultdict(int)
+        self.apply_seconds = 0.0
+        self.started = time.perf_counter()
+
+    # Function to drain the event queue, one batch per wake-up. A batch that fails is
+    # reported and counted as applied, so the applier and "sync" keep going.
+    async def apply_events(self):
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: self.pending)
+                batch, self.pending = self.pending, []
+            start = time.perf_counter()
+            try:
+                changes = net_changes(self.graph, batch, self.counts)
+                if changes:
+                    self.exact = update_spf_trees(self.graph, self.trees, changes, self.exact)
+            except Exception as error:
+                print(f"Failed to apply a batch of {len(batch)} events: {error!r}")
+                self.counts["failed_batches"] += 1
+            self.apply_seconds += time.perf_counter() - start
+            self.counts["batches"] += 1
+            async with self.changed:
+                self.applied += len(batch)
+                self.changed.notify_all()
+            await asyncio.sleep(0)
+
+    async def queue_event(self, event_time, change):
+        async with self.changed:
+            self.pending.append(change)
+            self.queued += 1
+            self.time = max(self.time, event_time)
+            self.changed.notify_all()
+            return {"queued": self.queued}
+
+    async def sync(self):
+        async with self.changed:
+            target = self.queued
+            await self.changed.wait_for(lambda: self.applied >= target)
+            return {"applied": self.applied}
+
+    def route(self, src, dst):
+        distances, previous_nodes = self.trees[src]
+        if distances[dst] == float('inf'):
+            return {"src": src, "dst": dst, "cost": None, "path": None}
+        path = [dst]
+        while previous_nodes[path[-1]] is not None:
+            path.append(previous_nodes[path[-1]])
+        path.reverse()
+        return {"src": src, "dst": dst, "cost": distances[dst], "path": path}
+
+    # Function to list (destination, cost, next hop) of a node, next hops found by
+    # walking each destination's predecessors up to the first hop once
+    def table(self, node):
+        distances, previous_nodes = self.trees[node]
+        hops = {node: None}
+        routes = []
+        for dest in distances:
+            chain = []
+            current = dest
+            while current not in hops:
+                chain.append(current)
+                parent = previous_nodes[current]
+                if parent == node:
+                    hops[current] = current
+                elif parent is None:
+                    hops[current] = None
+                else:
+                    current = parent
+            for visited in chain:
+                hops[visited] = hops[current]
+            cost = distances[dest]
+            routes.append([dest, cost if cost != float('inf') else None, hops[dest]])
+        return {"node": node, "routes": routes}
+
+    def metrics(self):
+        uptime = time.perf_counter() - self.started
+        queries = {}
+        for kind, latencies in self.latencies.items():
+            values = sorted(latencies)
+            queries[kind] = {"count": self.counts[kind],
+                             **{f"p{p}_ms": round(percentile(values, p) * 1000, 3) for p in (50, 90, 99)},
+                             "max_ms": round(values[-1] * 1000, 3)}
+        return {"nodes": len(self.graph), "time": self.time, "queries": queries,
+                "events": {"queued": self.queued, "applied": self.applied, "batches": self.counts["batches"],
+                           "failed_batches": self.counts["failed_batches"],
+                           "net_changes": self.counts["kept"], "noops": self.counts["noops"],
+                           "apply_seconds": round(self.apply_seconds, 3),
+                           "per_second": round(self.applied / uptime, 1) if uptime else None,
+                           "per_apply_second": round(self.applied / self.apply_seconds, 1)
+                           if self.apply_seconds else None},
+                "uptime_seconds": round(uptime, 3)}
+
+    # Function to answer one request line
+    async def request(self, line):
+        event = parse_event(line)
+        if event is not None:
+            return await self.queue_event(*event)
+        command, *arguments = line.split()
+        if command == "sync" and not arguments:
+            return await self.sync()
+        if command == "metrics" and not arguments:
+            return self.metrics()
+        start = time.perf_counter()
+        if command == "route" and len(arguments) == 2:
+            response = self.route(*arguments)
+        elif command == "table" and len(arguments) == 1:
+            response = self.table(*arguments)
+        else:
+            return {"error": f"unknown request: {line}"}
+        self.latencies[command].append(time.perf_counter() - start)
+        self.counts[command] += 1
+        return response
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode().strip()
+                if not line:
+                    continue
+                if line == "quit":
+                    break
+                try:
+                    response = await self.request(line)
+                except KeyError as error:
+                    response = {"error": f"unknown node {error.args[0]}"}
+                except ValueError as error:
+                    response = {"error": str(error)}
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, tcp=None, unix=None):
+        applier = asyncio.create_task(self.apply_events())
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, path=unix)
+        else:
+            host, port = tcp.rsplit(":", 1)
+            server = await asyncio.start_server(self.handle, host, int(port))
+        print(f"routing daemon on {unix or tcp} with {len(self.graph)} nodes")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            applier.cancel()
+
+
+# Client for the daemon (and its load test)
+class RoutingClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, tcp=None, unix=None):
+        if unix:
+            return cls(*await asyncio.open_unix_connection(unix))
+        host, port = tcp.rsplit(":", 1)
+        return cls(*await asyncio.open_connection(host, int(port)))
+
+    async def request(self, line):
+        self.writer.write((line + "\n").encode())
+        await self.writer.drain()
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        self.writer.write(b"quit\n")
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+# Function to stream the change events of a topology file (the daemon started from
+# its time 0 graph) while clients send random route and table queries; with check,
+# compares the routes after the last event with dijkstra() on the final graph
+async def run_client(input_file, tcp=None, unix=None, clients=4, queries=200, check=False, seed=1):
+    graph, time_changes = parse_input_file(input_file)
+    events = [f"{change_time}: {u}, {v}, {DOWN if cost is None else cost}"
+              for change_time in sorted(time_changes) for u, v, cost in time_changes[change_time]]
+    nodes = list(graph)
+    rng = random.Random(seed)
+
+    async def send_events():
+        client = await RoutingClient.connect(tcp, unix)
+        start = time.perf_counter()
+        for line in events:
+            await client.request(line)
+        applied = await client.request("sync")
+        seconds = time.perf_counter() - start
+        await client.close()
+        return applied, seconds
+
+    async def send_queries(count):
+        client = await RoutingClient.connect(tcp, unix)
+        for _ in range(count):
+            if rng.random() < 0.9:
+                await client.request(f"route {rng.choice(nodes)} {rng.choice(nodes)}")
+            else:
+                await client.request(f"table {rng.choice(nodes)}")
+        await client.close()
+
+    results = await asyncio.gather(send_events(), *(send_queries(queries) for _ in range(clients)))
+    applied, seconds = results[0]
+    client = await RoutingClient.connect(tcp, unix)
+    print(f"sent {len(events)} events in {seconds:.3f}s ({len(events) / seconds:.0f}/s), {applied}")
+    print(json.dumps(await client.request("metrics"), indent=2))
+
+    if check:
+        for change_time in sorted(time_changes):
+            apply_time_changes(graph, time_changes, change_time)
+        mismatches = 0
+        for src in nodes[:20]:
+            distances = dijkstra(graph, src)[0]
+            for dst in nodes:
+                cost = (await client.request(f"route {src} {dst}"))["cost"]
+                mismatches += (cost if cost is not None else float('inf')) != distances[dst]
+        print(f"{mismatches} route costs differ from dijkstra() on the final graph")
+    await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Routing daemon with live change events and route queries.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the daemon")
+    serve.add_argument("input_file", nargs="?", help="topology whose time 0 graph the daemon starts from")
+    client = commands.add_parser("client", help="stream a topology's events and query the daemon")
+    client.add_argument("input_file")
+    client.add_argument("--clients", type=int, default=4, help="concurrent query connections")
+    client.add_argument("--queries", type=int, default=200, help="queries per connection")
+    client.add_argument("--check", action="store_true", help="compare the final routes with dijkstra()")
+    for command in (serve, client):
+        command.add_argument("--tcp", default=DEFAULT_TCP, help=f"host:port (default: {DEFAULT_TCP})")
+        command.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        graph = parse_input_file(args.input_file)[0] if args.input_file else None
+        try:
+            asyncio.run(RoutingDaemon(graph).serve(args.tcp, args.unix))
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(run_client(args.input_file, args.tcp, args.unix, args.clients, args.queries, args.check))
+
+if __name__ == "__main__":
+    main()
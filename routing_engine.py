@@ -0,0 +1,721 @@
+import argparse
+import os
+import re
+from copy import deepcopy
+from collections import defaultdict
+from async_dv import distance_vector_async
+from binary_format import BINARY_SUFFIX, load_binary_topology
+from bucket_queue import bucket_dijkstra, max_link_cost, use_buckets
+from compact_graph import CompactGraph, compact_dijkstra
+from dv_numpy import distance_vector_numpy
+from dv_history import DeltaHistory
+from event_coalescing import coalesce_changes, coalescing_report
+from failure_events import expand_failures, invalidated_routes, link_cost, parse_cost, worsened_links
+from instrumentation import heap_functions, phase, trace_repair, trace_round, trace_spf
+from topology_store import VersionedTopology
+from output_writer import (step_rows, vector_rows, write_dv_changes, write_dv_files, write_dv_table, write_spf_changes,
+                           write_spf_files, write_spf_table)
+from parallel_spf import parallel_spf
+from result_cache import (DEFAULT_CACHE_SIZE, ResultCache, chain_key, decode_timestep, decode_trees, dv_key,
+                          encode_timestep, encode_trees, graph_key)
+from stream_parser import EventStream
+
+# Routing engine shared by Vectors.py, VectorsS.py, NoVectors.py and NovectorsS.py.
+#
+# The four scripts only differ in how strictly they read the input, whether the
+# distance vector tables restart at every timestep, and the columns of their DV
+# output. Those are options here: an input dialect, reset_tables, and an output
+# format. The scripts are thin wrappers that pick their own combination.
+#
+# Input dialects ("time: u, v, cost" lines):
+#   spaced    exactly ": " and ", " between the fields (Vectors.py, NoVectors.py)
+#   unspaced  ":" and "," with any spacing around them (VectorsS.py)
+#   regex     ":" then fields split on any run of commas and blanks (NovectorsS.py)
+#
+# DV output formats: vector adds the local distance vector column, step adds the
+# step number column; plain has neither and step-vector both.
+#
+# python routing_engine.py topology.txt --dialect regex --format step --reset-tables
+
+
+# Functions to split one input line into (time, u, v, cost); None skips the line
+def split_spaced(line):
+    if ': ' not in line:
+        return None
+    time, data = line.split(': ')
+    u, v, cost = data.split(', ')
+    return time, u.strip(), v.strip(), cost
+
+def split_unspaced(line):
+    if ':' not in line:
+        return None
+    time, data = line.split(':', 1)
+    u, v, cost = map(str.strip, data.split(','))
+    return time, u, v, cost
+
+def split_regex(line):
+    if ':' not in line:
+        return None
+    time, data = line.split(':', 1)
+    u, v, cost = map(str.strip, re.split(r'[,\s]+', data.strip()))
+    return time, u, v, cost
+
+DIALECTS = {"spaced": split_spaced, "unspaced": split_unspaced, "regex": split_regex}
+
+# DV output formats: (header, row builder, step column)
+FORMATS = {
+    "vector": ("Timestep\tDestination\tNextHop\tOverallCost\tLocal Distance Vector\n", vector_rows, False),
+    "step": ("TimeStep\tStep\tDestination\tNextHop\tCost\n", step_rows, True),
+    "plain": ("Timestep\tDestination\tNextHop\tCost\n", step_rows, False),
+    "step-vector": ("TimeStep\tStep\tDestination\tNextHop\tOverallCost\tLocal Distance Vector\n", vector_rows, True),
+}
+
+
+# Function to parse the input file
+def parse_input_file(file_path, compact=False, dialect="spaced"):
+    if file_path.endswith(BINARY_SUFFIX):
+        return load_binary_topology(file_path, compact)
+
+    split_line = DIALECTS[dialect]
+    initial_edges = defaultdict(list)
+    time_changes = defaultdict(list)
+
+    with open(file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            try:
+                fields = split_line(line) if line else None
+                if fields is None:
+                    print(f"Skipping invalid line: {line}")
+                    continue
+                time, u, v, cost = fields
+                time = int(time)
+                cost = parse_cost(cost, time)
+                if time == 0:
+                    initial_edges[u].append((v, cost))
+                    initial_edges[v].append((u, cost))  
+                else:
+                    time_changes[time].append((u, v, cost))
+            except ValueError as e:
+                print(f"Error parsing line '{line}': {e}")
+                continue
+    if compact:
+        initial_edges = CompactGraph.from_adjacency(initial_edges)
+    return initial_edges, time_changes
+
+# Function to perform Dijkstra's algorithm for SPF. Graphs whose costs are small ints
+# use the bucket queue kernel (bucket_queue.py), which gives the same result; loops
+# over every node pass the graph's max_link_cost() once instead of rescanning it.
+def dijkstra(graph, source, max_cost=None):
+    if isinstance(graph, CompactGraph):
+        return compact_dijkstra(graph, source, max_cost)
+    if max_cost is None:
+        max_cost = max_link_cost(graph)
+    if use_buckets(max_cost, len(graph)):
+        return bucket_dijkstra(graph, source, max_cost)
+    distances = {node: float('inf') for node in graph}
+    previous_nodes = {node: None for node in graph}
+    distances[source] = 0
+    pq = [(0, source)]  # Priority queue
+    heappush, heappop = heap_functions()
+    stale = relaxations = 0
+
+    while pq:
+        current_distance, current_node = heappop(pq)
+
+        if current_distance > distances[current_node]:
+            stale += 1
+            continue
+
+        edges = graph[current_node]
+        relaxations += len(edges)
+        for neighbor, weight in edges:
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                previous_nodes[neighbor] = current_node
+                heappush(pq, (distance, neighbor))
+
+    trace_spf(stale, relaxations)
+    return distances, previous_nodes
+
+# Distance Vector Algorithm with consistent step count.
+#
+# By default the local vectors persist across timesteps: routes over links that got
+# worse are invalidated and the rest are kept. reset_tables restarts every table
+# from scratch at each timestep instead (VectorsS.py, NoVectors.py, NovectorsS.py),
+# and then a round counts as quiet when the round before it changed nothing.
+#
+# timestep_steps caps the rounds of each timestep (default 100), so a long early
+# convergence cannot starve the events after it; max_steps can also cap the rounds
+# of the whole run (None, the default: no cap). A timestep ends after stability_threshold quiet rounds in a row, or
+# after the first one with stop_when_quiet: a round without deltas is a fixed point,
+# the rounds after it cannot change anything. history.convergence gets one entry per
+# timestep (rounds, updates, invalidated routes, whether it converged).
+#
+# Every node keeps the tick of its last scan and of its last change. A node only
+# relaxes against the neighbours that changed since it last scanned them, the other
+# ones cannot offer anything better than what it already has; the first round of a
+# timestep scans everything, since links and routes may just have changed.
+#
+# resume continues an earlier run: a DeltaHistory holding its first timesteps, whose
+# replay() gives the tables to go on from (result_cache.py).
+def distance_vector(graph, time_changes, max_steps=None, stability_threshold=3, backend="python",
+                    timestep_steps=100, stop_when_quiet=False, reset_tables=False, resume=None):
+    if backend == "numpy":
+        return distance_vector_numpy(graph, time_changes, max_steps, stability_threshold, reset_tables,
+                                     timestep_steps=timestep_steps, stop_when_quiet=stop_when_quiet, resume=resume)
+    if backend == "async":
+        if reset_tables or resume is not None:
+            raise ValueError("The async distance vector backend keeps its tables across timesteps and cannot resume")
+        return distance_vector_async(graph, time_changes)
+    nodes = list(graph.keys())
+    if resume is None:
+        history = DeltaHistory(nodes)
+        next_hops = {node: {dest: None for dest in nodes} for node in nodes}
+        local_vectors = None
+    else:
+        history = resume
+        local_vectors, next_hops = history.replay(reset_tables)
+
+    total_steps = history.steps[-1][1] if history.steps else 0
+    threshold = 1 if stop_when_quiet else stability_threshold
+    tick = 0
+    changed_at = dict.fromkeys(nodes, 0)
+
+    # Versions share everything the changes did not touch, and changes accumulate
+    topology = VersionedTopology(graph, time_changes)
+    times = sorted([0] + list(time_changes.keys()))
+    done = len(history.convergence)
+    previous_graph = topology.version(times[done - 1]) if done else None
+    for current_time in times[done:]:
+        with phase("dv_timestep", time=current_time) as timestep:
+            dv_graph = topology.version(current_time)
+
+            # Initialize self-costs
+            if local_vectors is None or reset_tables:
+                local_vectors = {node: {dest: float('inf') for dest in nodes} for node in nodes}
+                for node in nodes:
+                    local_vectors[node][node] = 0
+
+            # Costs are only ever lowered below, so routes crossing a link that got more
+            # expensive or failed are dropped first; every other route is kept. The drops
+            # go into the history with the first round, so when no round is left (max_steps
+            # spent) the routes are kept as they are, as the history would replay them.
+            invalidated = []
+            has_rounds = ((max_steps is None or total_steps < max_steps)
+                          and (timestep_steps is None or timestep_steps > 0))
+            if has_rounds and previous_graph is not None and not reset_tables and current_time in time_changes:
+                worsened = worsened_links(previous_graph, dv_graph, time_changes[current_time])
+                for node, dest in list(invalidated_routes(nodes, lambda node, dest: next_hops[node][dest], worsened)):
+                    invalidated.append((node, dest, local_vectors[node][dest], float('inf'), None))
+                    local_vectors[node][dest] = float('inf')
+                    next_hops[node][dest] = None
+            previous_graph = dv_graph
+            num_invalidated = timestep["invalidated"] = len(invalidated)
+            scanned_at = dict.fromkeys(nodes, -1)
+
+            stable_iterations = rounds = updates = 0
+            converged = False
+            changed_last_round = None
+            reset = reset_tables
+
+            while ((max_steps is None or total_steps < max_steps)
+                   and (timestep_steps is None or rounds < timestep_steps)):
+                updated = False
+                total_steps += 1  
+                rounds += 1
+                deltas, invalidated = invalidated, []
+
+                # For each node, update its distance vector from the neighbours that changed
+                for node in nodes:
+                    last_scan = scanned_at[node]
+                    tick += 1
+                    scanned_at[node] = tick
+                    vector = local_vectors[node]
+                    for neighbor, cost in dv_graph[node]: 
+                        if changed_at[neighbor] <= last_scan:
+                            continue
+                        neighbor_vector = local_vectors[neighbor]
+                        for dest in nodes:
+                            if neighbor_vector[dest] < float('inf'):
+                                new_cost = cost + neighbor_vector[dest]
+                                if new_cost < vector[dest]:
+                                    deltas.append((node, dest, vector[dest], new_cost, neighbor))
+                                    vector[dest] = new_cost
+                                    next_hops[node][dest] = neighbor
+                                    changed_at[node] = tick
+                                    updated = True
+
+                # Check for stability: a round without deltas left the vectors unchanged
+                if reset_tables:
+                    quiet = changed_last_round is False
+                    changed_last_round = updated
+                else:
+                    quiet = not deltas
+                stable_iterations = stable_iterations + 1 if quiet else 0
+
+                changed = history.record(current_time, total_steps, deltas, reset)
+                trace_round(current_time, total_steps, changed)
+                reset = False
+                updates += changed
+
+                # Stop if stable for the required threshold
+                if not updated and stable_iterations >= threshold:
+                    converged = True
+                    break
+            timestep["rounds"] = rounds
+            history.record_convergence(current_time, rounds, updates, num_invalidated, converged)
+
+    return history, next_hops, local_vectors
+
+# Function to apply graph updates based on time changes
+def apply_time_changes(graph, time_changes, current_time):
+    if current_time in time_changes:
+        with phase("apply_time_changes", time=current_time, changes=len(time_changes[current_time])):
+            for u, v, cost in expand_failures(graph, time_changes[current_time]):
+                update_link(graph, u, v, cost)
+
+# Function to set the cost of a single link in both directions (None removes it)
+def update_link(graph, u, v, cost):
+    if isinstance(graph, CompactGraph):
+        graph.set_cost(u, v, cost)
+        return
+    if cost is None:
+        for a, b in ((u, v), (v, u)):
+            if a in graph:
+                graph[a] = [edge for edge in graph[a] if edge[0] != b]
+        return
+    for i, (neighbor, weight) in enumerate(graph[u]):
+        if neighbor == v:
+            graph[u][i] = (v, cost)
+            break
+    else:
+        graph[u].append((v, cost))
+    for i, (neighbor, weight) in enumerate(graph[v]):
+        if neighbor == u:
+            graph[v][i] = (u, cost)
+            break
+    else:
+        graph[v].append((u, cost))
+
+# Function to repair one shortest-path tree after the cost of link (u, v) changes.
+# Only nodes whose distance can move are touched: a decrease is propagated outwards
+# from the cheaper endpoint, an increase or a failure (new_cost None) re-settles the
+# subtree hanging off the link. Returns False when the tree is unaffected.
+def repair_spf_tree(graph, source, distances, previous_nodes, u, v, old_cost, new_cost):
+    if old_cost == new_cost:
+        return False
+
+    changed = set()
+    pq = []
+    heappush, heappop = heap_functions()
+    stale = relaxations = 0
+    if old_cost is None or (new_cost is not None and new_cost < old_cost):
+        if distances[u] + new_cost > distances[v] and distances[v] + new_cost > distances[u]:
+            return False
+        for a, b in ((u, v), (v, u)):
+            distance = distances[a] + new_cost
+            if distance < distances[b]:
+                distances[b] = distance
+                changed.add(b)
+                heappush(pq, (distance, b))
+    else:
+        if previous_nodes[v] == u:
+            root = v
+        elif previous_nodes[u] == v:
+            root = u
+        else:
+            return False
+
+        # Collect the subtree that reached the source through the link
+        subtree = {root}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for neighbor, weight in graph[node]:
+                if neighbor not in subtree and previous_nodes[neighbor] == node:
+                    subtree.add(neighbor)
+                    stack.append(neighbor)
+
+        old_distances = {node: distances[node] for node in subtree}
+        for node in subtree:
+            distances[node] = float('inf')
+        for node in subtree:
+            for neighbor, weight in graph[node]:
+                if neighbor not in subtree and distances[neighbor] + weight < distances[node]:
+                    distances[node] = distances[neighbor] + weight
+            if distances[node] < float('inf'):
+                heappush(pq, (distances[node], node))
+        changed = subtree
+
+    while pq:
+        current_distance, current_node = heappop(pq)
+
+        if current_distance > distances[current_node]:
+            stale += 1
+            continue
+
+        edges = graph[current_node]
+        relaxations += len(edges)
+        for neighbor, weight in edges:
+            distance = current_distance + weight
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                changed.add(neighbor)
+                heappush(pq, (distance, neighbor))
+    trace_repair(stale, relaxations)
+
+    if old_cost is not None and (new_cost is None or new_cost > old_cost):
+        changed = {node for node in changed if distances[node] != old_distances[node]}
+
+    # Re-pick predecessors around the changed region the way dijkstra() would:
+    # the first settled neighbour, i.e. the lowest (distance, name) on a shortest path
+    affected = set(changed)
+    affected.update((u, v))
+    for node in changed:
+        affected.update(neighbor for neighbor, weight in graph[node])
+    for node in affected:
+        if node == source or distances[node] == float('inf'):
+            previous_nodes[node] = None
+            continue
+        best = None
+        for neighbor, weight in graph[node]:
+            if distances[neighbor] + weight == distances[node]:
+                if best is None or (distances[neighbor], neighbor) < (distances[best], best):
+                    best = neighbor
+        previous_nodes[node] = best
+    return True
+
+# Function to apply one timestep's changes to the graph and repair the SPF tree of
+# every source in `trees`. Trees are copied on first write, so snapshots taken at
+# earlier timesteps stay intact. Returns False once a non-positive cost makes the
+# repairs inexact; the trees are then recomputed from scratch.
+def update_spf_trees(graph, trees, changes, exact=True):
+    copied = set()
+    for u, v, cost in expand_failures(graph, changes):
+        old_cost = link_cost(graph, u, v)
+        update_link(graph, u, v, cost)
+        new_cost = link_cost(graph, u, v)
+        exact = exact and (new_cost is None or new_cost > 0)
+
+        # Newly seen nodes start out unreachable in every existing tree
+        for node in list(graph):
+            if node not in trees:
+                for source, (distances, previous_nodes) in trees.items():
+                    if source not in copied:
+                        distances, previous_nodes = dict(distances), dict(previous_nodes)
+                        trees[source] = (distances, previous_nodes)
+                        copied.add(source)
+                    distances[node] = float('inf')
+                    previous_nodes[node] = None
+                trees[node] = dijkstra(graph, node)
+                copied.add(node)
+        if not exact:
+            continue
+
+        for node in graph:
+            distances, previous_nodes = trees[node]
+            if node not in copied:
+                distances, previous_nodes = dict(distances), dict(previous_nodes)
+            if repair_spf_tree(graph, node, distances, previous_nodes, u, v, old_cost, new_cost):
+                trees[node] = (distances, previous_nodes)
+                copied.add(node)
+
+    if not exact:
+        trees.update(spf_trees(graph))
+    return exact
+
+# Function to run dijkstra() from every node, scanning the link costs only once
+def spf_trees(graph):
+    max_cost = None if isinstance(graph, CompactGraph) else max_link_cost(graph)
+    return {node: dijkstra(graph, node, max_cost) for node in graph}
+
+# Function to run SPF for every source at every timestep, updating the graph in place
+def full_spf(graph, time_changes):
+    spf_results = {node: {} for node in graph.keys()}
+    for time in sorted([0] + list(time_changes.keys())):
+        if time > 0:
+            apply_time_changes(graph, time_changes, time)
+        with phase("spf_timestep", time=time):
+            for node, (distances, paths) in spf_trees(graph).items():
+                spf_results.setdefault(node, {})[time] = (distances, paths)
+    return spf_results
+
+# Function to run SPF for every source across all timesteps, repairing the existing
+# trees on each change instead of recomputing them. Produces the same results as
+# calling dijkstra() for every node at every timestep (link costs must be positive,
+# otherwise the timestep falls back to a full recompute).
+def incremental_spf(graph, time_changes):
+    with phase("spf_timestep", time=0):
+        trees = spf_trees(graph)
+    spf_results = {node: {} for node in graph}
+    exact = all(weight > 0 for edges in graph.values() for neighbor, weight in edges)
+
+    for time in sorted([0] + list(time_changes.keys())):
+        if time > 0 and time in time_changes:
+            with phase("spf_timestep", time=time, incremental=True):
+                exact = update_spf_trees(graph, trees, time_changes[time], exact)
+
+        for node in graph:
+            spf_results.setdefault(node, {})[time] = trees[node]
+
+    return spf_results
+
+# Function to run SPF while the input is still being read: each timestamp group from
+# the EventStream is computed as soon as it is complete, starting with time 0.
+# Returns the parsed topology too, so the distance vector run can reuse it.
+def streaming_spf(events, incremental=False, compact=False):
+    initial_graph = defaultdict(list)
+    time_changes = defaultdict(list)
+    graph_spf = None
+    spf_results = {}
+    previous_time = None
+
+    for time, changes in events:
+        if time < 0 or (previous_time is not None and time <= previous_time):
+            raise ValueError(f"{events.file_path} is not time-ordered at time {time}; run without streaming")
+        previous_time = time
+
+        if time == 0:
+            for u, v, cost in changes:
+                initial_graph[u].append((v, cost))
+                initial_graph[v].append((u, cost))
+        else:
+            time_changes[time].extend(changes)
+
+        if graph_spf is None:
+            if compact:
+                initial_graph = CompactGraph.from_adjacency(initial_graph)
+            graph_spf = deepcopy(initial_graph)
+            trees = spf_trees(graph_spf)
+            exact = all(weight > 0 for edges in graph_spf.values() for neighbor, weight in edges)
+            for node in graph_spf:
+                spf_results.setdefault(node, {})[0] = trees[node]
+        if time == 0:
+            continue
+
+        if incremental:
+            exact = update_spf_trees(graph_spf, trees, changes, exact)
+        else:
+            apply_time_changes(graph_spf, time_changes, time)
+            trees = spf_trees(graph_spf)
+        for node in graph_spf:
+            spf_results.setdefault(node, {})[time] = trees[node]
+
+    if graph_spf is None and compact:
+        initial_graph = CompactGraph.from_adjacency(initial_graph)
+    return initial_graph, time_changes, spf_results
+
+# Function to run SPF for every source at every timestep like full_spf() (or
+# incremental_spf()), taking the trees of every timestep whose graph is in the
+# ResultCache from it and storing the others
+def cached_spf(graph, time_changes, cache, incremental=False):
+    times = sorted([0] + list(time_changes.keys()))
+    topology = VersionedTopology(graph, time_changes)
+    keys = [graph_key(topology.version(time)) for time in times]
+    spf_results = {}
+    trees = None
+    for time, key in zip(times, keys):
+        data = cache.get(key, "spf_")
+        computed = False
+        if time > 0:
+            if data is None and incremental and trees is not None:
+                exact = all(weight > 0 for edges in graph.values() for neighbor, weight in edges)
+                update_spf_trees(graph, trees, time_changes[time], exact)
+                computed = True
+            else:
+                apply_time_changes(graph, time_changes, time)
+        with phase("spf_timestep", time=time, cached=data is not None):
+            if data is not None:
+                trees = decode_trees(data)
+            elif not computed:
+                trees = spf_trees(graph)
+        if data is None:
+            encoded = encode_trees(trees)
+            if encoded is not None:
+                cache.put(key, encoded)
+        for node, tree in trees.items():
+            spf_results.setdefault(node, {})[time] = tree
+    return spf_results
+
+# Function to run distance_vector() with the ResultCache: the longest prefix of
+# timesteps found in the cache is replayed and the run resumes after it
+def cached_distance_vector(graph, time_changes, cache, **dv_options):
+    times = sorted([0] + list(time_changes.keys()))
+    keys = [dv_key(graph, {name: value for name, value in dv_options.items() if name != "backend"})]
+    for time in times[1:]:
+        keys.append(chain_key(keys[-1], time, time_changes[time]))
+
+    history = DeltaHistory(list(graph.keys()))
+    for key in keys:
+        data = cache.get(key, "dv_")
+        if data is None:
+            break
+        history.append_timestep(*decode_timestep(data))
+    done = len(history.convergence)
+    history, next_hops, local_vectors = distance_vector(graph, time_changes, resume=history if done else None,
+                                                        **dv_options)
+    steps = defaultdict(list)
+    for step in history.steps:
+        steps[step[0]].append(step)
+    for i in range(done, len(times)):
+        cache.put(keys[i], encode_timestep(steps[times[i]], history.convergence[i]))
+    return history, next_hops, local_vectors
+
+# Function to write SPF results (changes: a change log instead of full tables)
+def write_spf_results(input_file, spf_results, table=False, changes=False):
+    base_name = os.path.splitext(input_file)[0]
+    if changes:
+        write_spf_changes(base_name, spf_results)
+    elif table:
+        write_spf_table(base_name, spf_results)
+    else:
+        write_spf_files(base_name, spf_results)
+
+# Function to write Distance Vector results in one of the FORMATS (header replaces its
+# header line). The change log (changes) always has the step format columns.
+def write_distance_vector_output(input_file, dv_history, next_hops, table=False, output_format="vector", header=None,
+                                 changes=False):
+    base_name = os.path.splitext(input_file)[0]
+    format_header, make_rows, with_step = FORMATS[output_format]
+    header = header or format_header
+    if changes:
+        write_dv_changes(base_name, dv_history, next_hops)
+    elif table:
+        write_dv_table(base_name, dv_history, next_hops, header, make_rows, with_step)
+    else:
+        write_dv_files(base_name, dv_history, next_hops, header, make_rows, with_step)
+
+# Function to run SPF for every source on the final topology only, skipping the
+# timesteps in between; the result has the final time as its only step
+def final_spf(graph, time_changes):
+    times = sorted([0] + list(time_changes.keys()))
+    for time in times[1:]:
+        apply_time_changes(graph, time_changes, time)
+    return {node: {times[-1]: tree} for node, tree in spf_trees(graph).items()}
+
+# Function to reduce a DV run to its final state, as a one-step history
+def final_dv_history(dv_history, local_vectors):
+    if not dv_history.steps:
+        return []
+    time, step = dv_history.steps[-1][:2]
+    return [(time, step, local_vectors)]
+
+# Main function. algo is "spf", "dv" or "both"; output files go next to the input
+# file unless output_dir is given. final_only writes the tables of the last timestep
+# only (and SPF then skips computing the timesteps in between); changes writes one
+# change log per algorithm instead of full tables. cache_dir keeps the SPF trees and
+# DV timesteps in a ResultCache of at most cache_size bytes for the next runs; SPF
+# then runs in this process, without streaming or workers, and the async DV backend
+# is not cached. coalesce_window reduces the changes to one net change per link
+# within each window of timestamps first (event_coalescing.py), and drops the
+# timesteps left without changes; it turns streaming off too.
+def main(input_file, incremental=False, compact=False, dv_backend="python", streaming=False, workers=0, table=False,
+         dialect="spaced", output_format="vector", reset_tables=False, dv_header=None, algo="both", output_dir=None,
+         max_steps=None, stability_threshold=3, timestep_steps=100, stop_when_quiet=False, final_only=False,
+         changes=False, cache_dir=None, cache_size=DEFAULT_CACHE_SIZE, coalesce_window=None):
+    run_spf, run_dv = algo in ("spf", "both"), algo in ("dv", "both")
+    dv_options = {"max_steps": max_steps, "stability_threshold": stability_threshold, "backend": dv_backend,
+                  "timestep_steps": timestep_steps, "stop_when_quiet": stop_when_quiet, "reset_tables": reset_tables}
+    cache = ResultCache(cache_dir, cache_size) if cache_dir else None
+    # A binary topology is already indexed by timestamp, so it is loaded instead of streamed
+    streaming = streaming and not input_file.endswith(BINARY_SUFFIX)
+    if streaming and run_spf and not final_only and cache is None and not coalesce_window:
+        # SPF starts on time 0 while the rest of the file is still being parsed
+        events = EventStream(input_file)
+        initial_graph, time_changes, spf_results = streaming_spf(events, incremental, compact)
+        for message in events.report():
+            print(message)
+        if run_dv:
+            dv_history, next_hops, local_vectors = distance_vector(initial_graph, time_changes, **dv_options)
+    else:
+        with phase("parse"):
+            initial_graph, time_changes = parse_input_file(input_file, compact, dialect)
+        if coalesce_window:
+            with phase("coalesce", window=coalesce_window):
+                time_changes, counts = coalesce_changes(initial_graph, time_changes, coalesce_window)
+            print(coalescing_report(counts))
+
+        # Distance vector only reads versions of the parsed graph, so it runs first
+        # and SPF then updates the same graph in place instead of a copy
+        if run_dv:
+            with phase("distance_vector", backend=dv_backend):
+                if cache is not None and dv_backend != "async":
+                    dv_history, next_hops, local_vectors = cached_distance_vector(initial_graph, time_changes, cache,
+                                                                                  **dv_options)
+                else:
+                    dv_history, next_hops, local_vectors = distance_vector(initial_graph, time_changes, **dv_options)
+        graph_spf = initial_graph
+
+        # SPF results
+        if run_spf:
+            with phase("spf", incremental=incremental, workers=workers):
+                if final_only:
+                    spf_results = final_spf(graph_spf, time_changes)
+                elif cache is not None:
+                    spf_results = cached_spf(graph_spf, time_changes, cache, incremental)
+                elif incremental:
+                    spf_results = incremental_spf(graph_spf, time_changes)
+                elif workers:
+                    spf_results = parallel_spf(graph_spf, time_changes, workers)
+                else:
+                    spf_results = full_spf(graph_spf, time_changes)
+
+    # Write outputs
+    output_file = input_file
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, os.path.basename(input_file))
+    if run_spf:
+        write_spf_results(output_file, spf_results, table, changes)
+    if run_dv:
+        if final_only:
+            dv_history = final_dv_history(dv_history, local_vectors)
+        write_distance_vector_output(output_file, dv_history, next_hops, table, output_format, dv_header, changes)
+    if cache is not None:
+        cache.trim()
+        counts = cache.counts
+        print(f"cache: {counts['spf_hits']} SPF and {counts['dv_hits']} DV timesteps of {len(time_changes) + 1} "
+              f"reused, {counts['evicted']} entries evicted")
+
+# Function to run main() from the command line. The wrapper scripts pass their own
+# defaults (dialect, format, reset_tables, dv_header, input file).
+def run_cli(argv=None, input_file="topology.txt", **defaults):
+    parser = argparse.ArgumentParser(description="SPF and distance vector routing over a timed topology.")
+    parser.add_argument("input_file", nargs="?", default=input_file, help=f"topology file (default: {input_file})")
+    parser.add_argument("--algo", default="both", choices=["spf", "dv", "both"])
+    parser.add_argument("--output-dir", help="write the output files here instead of next to the input")
+    parser.add_argument("--final-only", action="store_true",
+                        help="only write the tables of the last timestep, not every step")
+    parser.add_argument("--table", action="store_true", help="one SPF and one DV table instead of a file per node")
+    parser.add_argument("--changes", action="store_true",
+                        help="write the first tables, then only the rows that change (see change_reader.py)")
+    parser.add_argument("--cache", help="directory of the result cache reused across runs")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE >> 20, help="cache size limit in MiB")
+    parser.add_argument("--coalesce", action="store_const", const=1, dest="coalesce_window",
+                        help="one net change per link per timestamp; drop no-op changes and empty timesteps")
+    parser.add_argument("--coalesce-window", type=int, dest="coalesce_window",
+                        help="like --coalesce, merging the timestamps less than this apart")
+    parser.add_argument("--format", default="vector", choices=sorted(FORMATS), help="DV output columns")
+    parser.add_argument("--dialect", default="spaced", choices=sorted(DIALECTS), help="input line syntax")
+    parser.add_argument("--incremental", action="store_true", help="repair SPF trees instead of recomputing them")
+    parser.add_argument("--workers", type=int, default=0, help="SPF worker processes (0: none)")
+    parser.add_argument("--compact", action="store_true", help="keep the graph in compact arrays")
+    parser.add_argument("--streaming", action="store_true", help="start SPF while the input is still being read")
+    parser.add_argument("--dv-backend", default="python", choices=["python", "numpy", "async"])
+    parser.add_argument("--reset-tables", action="store_true", help="restart the DV tables at every timestep")
+    parser.add_argument("--max-steps", type=int, default=0, help="DV rounds of the whole run (0: no cap)")
+    parser.add_argument("--timestep-steps", type=int, default=100, help="DV rounds of each timestep (0: no cap)")
+    parser.add_argument("--stability-threshold", type=int, default=3, help="quiet DV rounds that end a timestep")
+    parser.add_argument("--stop-when-quiet", action="store_true", help="end a timestep at its first quiet round")
+    parser.set_defaults(**{"dv_header": None, **defaults})
+    args = parser.parse_args(argv)
+    main(args.input_file, args.incremental, args.compact, args.dv_backend, args.streaming, args.workers, args.table,
+         args.dialect, args.format, args.reset_tables, args.dv_header, args.algo, args.output_dir,
+         args.max_steps or None, args.stability_threshold, args.timestep_steps or None, args.stop_when_quiet,
+         args.final_only, args.changes, args.cache, args.cache_size << 20, args.coalesce_window)
+
+# Entry point
+if __name__ == "__main__":
+    run_cli()
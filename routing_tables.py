@@ -0,0 +1,180 @@
+from array import array
+from collections import OrderedDict, defaultdict
+
+from compact_graph import CompactGraph, dijkstra_ids
+from topology_store import VersionedTopology
+from routing_engine import update_spf_trees
+
+# Routing table service: the all-pairs SPF tables of any timestep, served from a
+# bounded LRU cache of per-timestep snapshots instead of keeping every
+# (distances, previous_nodes) dict of every source and timestep alive.
+#
+# A snapshot holds one version of the topology in two flat arrays indexed by
+# source * N + destination: the costs (UNREACHABLE for no path) and the predecessor
+# IDs (-1 for none), with node IDs following the sorted names like CompactGraph.
+# That is 12 bytes per pair instead of two dict entries and a float per pair.
+#
+# Snapshots are kept while their total size stays within memory_budget bytes; the
+# least recently used ones are evicted first (the one just built is always kept). A
+# miss is rebuilt from the nearest earlier cached snapshot by repairing its trees
+# with the changes in between (update_spf_trees), when there are at most
+# max_repair_changes of them, and otherwise recomputed with dijkstra_ids() on the
+# version. Either way the tables are the same as dijkstra() on that version.
+#
+# service = RoutingTableService(graph, time_changes, memory_budget=256 << 20)
+# service.cost(time, src, dst), service.path(time, src, dst), service.tree(time, src)
+# service.stats() -> hits, misses, rebuilt, recomputed, evictions, snapshots, bytes
+UNREACHABLE = -(1 << 63)
+
+
+# All-pairs SPF tables of one topology version
+class RoutingSnapshot:
+    def __init__(self, nodes, costs, predecessors):
+        self.nodes = nodes  # key order of the version
+        self.names = sorted(nodes)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.costs = costs
+        self.predecessors = predecessors
+
+    @classmethod
+    def compute(cls, graph):
+        compact = CompactGraph.from_adjacency(graph)
+        num_nodes = len(compact.names)
+        costs = array('q', [UNREACHABLE]) * (num_nodes * num_nodes)
+        predecessors = array('i', [-1]) * (num_nodes * num_nodes)
+        for source in range(num_nodes):
+            distances, previous_nodes = dijkstra_ids(compact, source)
+            row = source * num_nodes
+            costs[row:row + num_nodes] = array('q', (UNREACHABLE if distance == float('inf') else distance
+                                                     for distance in distances))
+            predecessors[row:row + num_nodes] = array('i', previous_nodes)
+        return cls(list(graph), costs, predecessors)
+
+    # Function to build a snapshot from name-keyed dijkstra() trees of every node
+    @classmethod
+    def from_trees(cls, nodes, trees):
+        snapshot = cls(list(nodes), None, None)
+        ids = snapshot.ids
+        num_nodes = len(ids)
+        costs = array('q', [UNREACHABLE]) * (num_nodes * num_nodes)
+        predecessors = array('i', [-1]) * (num_nodes * num_nodes)
+        for source, (distances, previous_nodes) in trees.items():
+            row = ids[source] * num_nodes
+            for dest, distance in distances.items():
+                if distance != float('inf'):
+                    costs[row + ids[dest]] = distance
+                if previous_nodes[dest] is not None:
+                    predecessors[row + ids[dest]] = ids[previous_nodes[dest]]
+        snapshot.costs, snapshot.predecessors = costs, predecessors
+        return snapshot
+
+    def nbytes(self):
+        return self.costs.itemsize * len(self.costs) + self.predecessors.itemsize * len(self.predecessors)
+
+    # Function to return the (distances, previous_nodes) dicts dijkstra() gives for source
+    def tree(self, source):
+        names, ids, num_nodes = self.names, self.ids, len(self.names)
+        row = ids[source] * num_nodes
+        costs, predecessors = self.costs, self.predecessors
+        distances, previous_nodes = {}, {}
+        for node in self.nodes:
+            cost, parent = costs[row + ids[node]], predecessors[row + ids[node]]
+            distances[node] = float('inf') if cost == UNREACHABLE else cost
+            previous_nodes[node] = names[parent] if parent >= 0 else None
+        return distances, previous_nodes
+
+    def cost(self, src, dst):
+        cost = self.costs[self.ids[src] * len(self.names) + self.ids[dst]]
+        return float('inf') if cost == UNREACHABLE else cost
+
+    # Function to return the SPF path [src, ..., dst], or None when dst is unreachable
+    def path(self, src, dst):
+        if self.cost(src, dst) == float('inf'):
+            return None
+        row = self.ids[src] * len(self.names)
+        path = [dst]
+        node = self.ids[dst]
+        while self.predecessors[row + node] >= 0:
+            node = self.predecessors[row + node]
+            path.append(self.names[node])
+        path.reverse()
+        return path
+
+    def next_hop(self, src, dst):
+        path = self.path(src, dst)
+        return path[1] if path and len(path) > 1 else None
+
+
+class RoutingTableService:
+    def __init__(self, graph, time_changes=None, memory_budget=256 << 20, max_repair_changes=None):
+        self.topology = VersionedTopology(graph, time_changes)
+        self.time_changes = time_changes or {}
+        self.memory_budget = memory_budget
+        self.max_repair_changes = len(self.topology.nodes) if max_repair_changes is None else max_repair_changes
+        self.snapshots = OrderedDict()  # version -> RoutingSnapshot, least recently used first
+        self.bytes = 0
+        self.counts = defaultdict(int)
+
+    # Function to return the snapshot of the topology at a time, building it on a miss
+    def snapshot(self, time):
+        version = self.topology.version(time).version
+        snapshot = self.snapshots.get(version)
+        if snapshot is not None:
+            self.counts["hits"] += 1
+            self.snapshots.move_to_end(version)
+            return snapshot
+
+        self.counts["misses"] += 1
+        snapshot = self._rebuild(version)
+        if snapshot is None:
+            self.counts["recomputed"] += 1
+            snapshot = RoutingSnapshot.compute(self.topology.version(self.topology.times[version]))
+        else:
+            self.counts["rebuilt"] += 1
+        self.snapshots[version] = snapshot
+        self.bytes += snapshot.nbytes()
+        while self.bytes > self.memory_budget and len(self.snapshots) > 1:
+            evicted_version, evicted = self.snapshots.popitem(last=False)
+            self.bytes -= evicted.nbytes()
+            self.counts["evictions"] += 1
+        return snapshot
+
+    # Function to repair the trees of the nearest earlier cached snapshot up to version,
+    # or None when there is none or too many changes lie in between
+    def _rebuild(self, version):
+        earlier = [cached for cached in self.snapshots if cached < version]
+        if not earlier:
+            return None
+        start = max(earlier)
+        times = self.topology.times[start + 1:version + 1]
+        if sum(len(self.time_changes[time]) for time in times) > self.max_repair_changes:
+            return None
+
+        cached = self.snapshots[start]
+        self.snapshots.move_to_end(start)
+        base = self.topology.version(self.topology.times[start])
+        graph = defaultdict(list, ((node, list(base[node])) for node in base))
+        trees = {node: cached.tree(node) for node in cached.nodes}
+        exact = all(weight > 0 for edges in graph.values() for neighbor, weight in edges)
+        for time in times:
+            exact = update_spf_trees(graph, trees, self.time_changes[time], exact)
+        return RoutingSnapshot.from_trees(graph, trees)
+
+    def tree(self, time, source):
+        return self.snapshot(time).tree(source)
+
+    def cost(self, time, src, dst):
+        return self.snapshot(time).cost(src, dst)
+
+    def path(self, time, src, dst):
+        return self.snapshot(time).path(src, dst)
+
+    def next_hop(self, time, src, dst):
+        return self.snapshot(time).next_hop(src, dst)
+
+    def stats(self):
+        lookups = self.counts["hits"] + self.counts["misses"]
+        return {"hits": self.counts["hits"], "misses": self.counts["misses"], "rebuilt": self.counts["rebuilt"],
+                "recomputed": self.counts["recomputed"], "evictions": self.counts["evictions"],
+                "hit_rate": round(self.counts["hits"] / lookups, 4) if lookups else None,
+                "snapshots": len(self.snapshots), "bytes": self.bytes, "memory_budget": self.memory_budget}
@@ -0,0 +1,103 @@
+import re
+from collections import Counter, defaultdict
+
+from failure_events import DOWN
+
+# One tokenizer for every input dialect: "0: A, B, 4", "0:A,B,4" and the
+# whitespace separated "0: A B 4" accepted by the regex parser all match, and so
+# do the failure events "5: A, B, down" and "5: A, *, down"
+LINE = re.compile(r'\s*(-?\d+)\s*:\s*([^\s,:]+)(?:\s*,\s*|\s+)([^\s,:]+)(?:\s*,\s*|\s+)(-?\d+|down)\s*')
+
+# Streaming topology parser. Reads the file in large chunks and yields
+# (time, [(u, v, cost), ...]) groups as soon as each timestamp is complete, so a
+# simulation can start on time 0 before the rest of the file is read.
+#
+# Bad lines are not printed one by one; they are counted in `skipped` (blank,
+# invalid) together with the first offending line of each kind, and summarised
+# once by report(). Timestamps are expected in order; a group that goes back in
+# time is still yielded but counted as out_of_order.
+class EventStream:
+    def __init__(self, file_path, chunk_size=1 << 20):
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.skipped = Counter()
+        self.first_skipped = {}
+        self.out_of_order = 0
+        self.lines = 0
+
+    # Function to read the file chunk by chunk and yield complete lines
+    def _lines(self):
+        with open(self.file_path, 'r') as file:
+            leftover = ''
+            while True:
+                chunk = file.read(self.chunk_size)
+                if not chunk:
+                    break
+                lines = (leftover + chunk).split('\n')
+                leftover = lines.pop()
+                yield from lines
+            if leftover:
+                yield leftover
+
+    def _skip(self, kind, line):
+        self.skipped[kind] += 1
+        self.first_skipped.setdefault(kind, (self.lines, line.strip()))
+
+    def __iter__(self):
+        match = LINE.fullmatch
+        current_time = None
+        changes = []
+        latest_time = None
+
+        for line in self._lines():
+            self.lines += 1
+            record = match(line)
+            if record is None:
+                self._skip('invalid' if line.strip() else 'blank', line)
+                continue
+            time, u, v, cost = record.groups()
+            time = int(time)
+            if cost == DOWN and time == 0:
+                self._skip('invalid', line)
+                continue
+            if time != current_time:
+                if changes:
+                    yield current_time, changes
+                if latest_time is not None and time < latest_time:
+                    self.out_of_order += 1
+                latest_time = time if latest_time is None else max(latest_time, time)
+                current_time, changes = time, []
+            changes.append((u, v, None if cost == DOWN else int(cost)))
+
+        if changes:
+            yield current_time, changes
+
+    # Function to summarise skipped lines in one message per kind
+    def report(self):
+        messages = []
+        for kind, count in sorted(self.skipped.items()):
+            line_number, line = self.first_skipped[kind]
+            messages.append(f"Skipped {count} {kind} line(s), first at line {line_number}: '{line}'")
+        if self.out_of_order:
+            messages.append(f"{self.out_of_order} timestamp group(s) were out of order")
+        return messages
+
+
+# Function to load a whole file into the (initial_edges, time_changes) shape
+# returned by parse_input_file, in any timestamp order
+def load_topology(file_path, chunk_size=1 << 20):
+    initial_edges = defaultdict(list)
+    time_changes = defaultdict(list)
+    stream = EventStream(file_path, chunk_size)
+
+    for time, changes in stream:
+        if time == 0:
+            for u, v, cost in changes:
+                initial_edges[u].append((v, cost))
+                initial_edges[v].append((u, cost))
+        else:
+            time_changes[time].extend(changes)
+
+    for message in stream.report():
+        print(message)
+    return initial_edges, time_changes
@@ -0,0 +1,67 @@
+import random
+import tempfile
+import unittest
+from collections import defaultdict
+
+import dv_numpy
+from result_cache import ResultCache
+from routing_engine import cached_distance_vector, distance_vector
+
+# Regression tests for the DV result cache: a run resumed from cached timesteps must
+# end with the same tables as the uncached run, also when max_steps runs out while
+# there are still timesteps with changes (their routes over worsened links must not
+# be dropped by one run and replayed by the other).
+
+
+# Function to build a random connected topology with cost changes and failures
+def random_topology(seed, num_nodes=12, num_links=24, num_times=8):
+    rng = random.Random(seed)
+    nodes = [f"N{i}" for i in range(num_nodes)]
+    links = {(nodes[rng.randrange(i)], nodes[i]) for i in range(1, num_nodes)}
+    while len(links) < num_links:
+        u, v = rng.sample(nodes, 2)
+        if (v, u) not in links:
+            links.add((u, v))
+    graph = defaultdict(list)
+    for u, v in sorted(links):
+        cost = rng.randint(1, 9)
+        graph[u].append((v, cost))
+        graph[v].append((u, cost))
+    time_changes = defaultdict(list)
+    for time in range(1, num_times + 1):
+        for _ in range(rng.randint(1, 3)):
+            u, v = rng.choice(sorted(links))
+            time_changes[time].append((u, v, None if rng.random() < 0.3 else rng.randint(1, 20)))
+    return graph, time_changes
+
+
+def tables(next_hops, local_vectors):
+    return next_hops, {node: dict(local_vectors[node]) for node in next_hops}
+
+
+class CachedDistanceVectorTest(unittest.TestCase):
+    def check_backend(self, backend):
+        for seed in range(20):
+            for max_steps in (3, 7, 12, None):
+                graph, time_changes = random_topology(seed)
+                options = {"max_steps": max_steps, "backend": backend}
+                history, next_hops, local_vectors = distance_vector(graph, time_changes, **options)
+                expected = tables(next_hops, local_vectors)
+                with tempfile.TemporaryDirectory() as directory:
+                    cache = ResultCache(directory)
+                    for run in ("cold", "warm"):
+                        history, next_hops, local_vectors = cached_distance_vector(graph, time_changes, cache,
+                                                                                   **options)
+                        with self.subTest(seed=seed, max_steps=max_steps, run=run):
+                            self.assertEqual(tables(next_hops, local_vectors), expected)
+
+    def test_python_backend(self):
+        self.check_backend("python")
+
+    @unittest.skipIf(dv_numpy.numpy is None, "numpy is not installed")
+    def test_numpy_backend(self):
+        self.check_backend("numpy")
+
+
+if __name__ == "__main__":
+    unittest.main()
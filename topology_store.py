@@ -0,0 +1,103 @@
+from bisect import bisect_right
+from collections.abc import Mapping
+
+from failure_events import expand_failures
+
+# Versioned topology: the time 0 graph plus every timestep's changes, kept as
+# persistent versions instead of one deepcopy per timestep.
+#
+# Each change copies only the adjacency lists of the two nodes it touches, and
+# stores the copy under the version number of its timestep (a "fat node" per
+# changed node). Version 0 is the time 0 graph, which is never modified; version
+# i is version i - 1 plus the changes of the i-th timestep, so changes accumulate.
+# version(time) is an O(1) read-only view, and each adjacency lookup in it is a
+# binary search over the revisions of that one node.
+class VersionedTopology:
+    def __init__(self, graph, time_changes=None):
+        self.base = graph
+        self.nodes = list(graph.keys())
+        self.first_version = {}
+        self.revisions = {}
+        self.times = [0]
+        for time in sorted(time_changes or ()):
+            if time > 0:
+                self.commit(time, time_changes[time])
+
+    # Function to return the adjacency list of node as it was at a version
+    def adjacency(self, node, version):
+        revisions = self.revisions.get(node)
+        if revisions is not None:
+            i = bisect_right(revisions[0], version) - 1
+            if i >= 0:
+                return revisions[1][i]
+        if node in self.base:
+            return self.base[node]
+        raise KeyError(node)
+
+    def exists(self, node, version):
+        return node in self.base or self.first_version.get(node, version + 1) <= version
+
+    # Function to get the adjacency list of node for the version being committed,
+    # copying it the first time the version touches the node
+    def _writable(self, node, version):
+        revisions = self.revisions.setdefault(node, ([], []))
+        if revisions[0] and revisions[0][-1] == version:
+            return revisions[1][-1]
+        if self.exists(node, version - 1):
+            edges = list(self.adjacency(node, version - 1))
+        else:
+            edges = []
+            self.nodes.append(node)
+            self.first_version[node] = version
+        revisions[0].append(version)
+        revisions[1].append(edges)
+        return edges
+
+    # Function to add the next timestep's (u, v, cost) changes and failures as a new version
+    def commit(self, time, changes):
+        if time <= self.times[-1]:
+            raise ValueError(f"Version for time {time} must come after time {self.times[-1]}")
+        version = len(self.times)
+        self.times.append(time)
+        for u, v, cost in expand_failures(TopologyVersion(self, version), changes):
+            for a, b in ((u, v), (v, u)):
+                if cost is None:
+                    if self.exists(a, version):
+                        edges = self._writable(a, version)
+                        edges[:] = [edge for edge in edges if edge[0] != b]
+                    continue
+                edges = self._writable(a, version)
+                for i, (neighbor, weight) in enumerate(edges):
+                    if neighbor == b:
+                        edges[i] = (b, cost)
+                        break
+                else:
+                    edges.append((b, cost))
+        return version
+
+    # Function to return the graph as it is at a time: the latest version at or before it
+    def version(self, time):
+        return TopologyVersion(self, bisect_right(self.times, time) - 1)
+
+
+# Read-only {node: [(neighbor, cost), ...]} view of one version
+class TopologyVersion(Mapping):
+    def __init__(self, store, version):
+        self.store = store
+        self.version = version
+
+    def __getitem__(self, node):
+        if not self.store.exists(node, self.version):
+            raise KeyError(node)
+        return self.store.adjacency(node, self.version)
+
+    def __iter__(self):
+        version = self.version
+        first_version = self.store.first_version
+        return (node for node in self.store.nodes if first_version.get(node, 0) <= version)
+
+    def __len__(self):
+        return sum(1 for node in self)
+
+    def __contains__(self, node):
+        return self.store.exists(node, self.version)